@@ -0,0 +1,228 @@
+"""
+Benchmarks - times the hot paths headless (SDL dummy video/audio drivers).
+
+    python benchmarks/run.py                  # run and compare with baseline.json
+    python benchmarks/run.py --save           # run and make the results the new baseline
+    python benchmarks/run.py --maps Sunny.json --frames 600
+    python benchmarks/run.py --stress         # also run on the generated stress charts
+
+Every result is seconds per call (per frame for gameplay). A result slower than
+the baseline by more than --tolerance is flagged, and the exit status is 1.
+Results are the fastest of several runs spread over a few rounds of the suite;
+each also has its spread (interquartile range / median). A benchmark that was
+noisy in the baseline run gets that spread on top of the tolerance, up to twice
+the tolerance in all.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pygame
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_FRAMES = 1200    # Gameplay frames per map per round (20 s at 60 FPS); 0 = whole song
+GRID_SAMPLES = 50        # Editor timeline positions per map
+# The whole suite runs this many times over, so a slow patch on the machine
+# (other processes, frequency scaling) can't land on every sample of one benchmark
+DEFAULT_ROUNDS = 3
+REPEAT = 3               # Timed runs per benchmark per round
+MIN_RUN_SECONDS = 0.05   # Each run makes enough calls to last at least this long
+
+
+def _run_calls(func, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return time.perf_counter() - start
+
+
+def time_calls(func, repeat=REPEAT):
+    """Seconds per call for each of `repeat` runs.
+
+    Like timeit's autorange, the number of calls per run is doubled until a run
+    takes MIN_RUN_SECONDS, so short calls aren't swamped by timer and scheduler noise.
+    """
+    func()  # Warm up (first loads also write caches)
+    number = 1
+    while _run_calls(func, number) < MIN_RUN_SECONDS:
+        number *= 2
+    return [_run_calls(func, number) / number for _ in range(repeat)]
+
+
+def measure(samples, name, func, per_call=1):
+    """Add timings of func (seconds, divided by per_call) to samples[name]."""
+    samples.setdefault(name, []).extend(t / per_call for t in time_calls(func))
+
+
+def label(map_file):
+    # Stress charts are passed as full paths; results are keyed by file name
+    return os.path.basename(map_file)
+
+
+def bench_maps(samples, map_files):
+    from game.map_manager import MapManager, MapData, MAPS_DIR
+
+    manager = MapManager()
+    measure(samples, "list_maps", manager.list_maps)
+    for name in map_files:
+        measure(samples, f"load_map[{label(name)}]", lambda: manager.load_map(name))
+        with open(os.path.join(MAPS_DIR, name), 'r') as f:
+            data = json.load(f)
+        measure(samples, f"map_data[{label(name)}]", lambda: MapData(data))
+
+
+def bench_gameplay(samples, map_files, screen, frames):
+    from game.screens.gameplay import GameplayScreen
+
+    dt = 1 / 60
+    for name in map_files:
+        game = GameplayScreen(name, autoplay=True, audio=False)
+        limit = frames or int((game.map_data.get_duration_ms() + 2000) / 1000 / dt)
+        update_times, draw_times = [], []
+        for _ in range(limit):
+            start = time.perf_counter()
+            game.update(dt)
+            mid = time.perf_counter()
+            game.draw(screen)
+            end = time.perf_counter()
+            update_times.append(mid - start)
+            draw_times.append(end - mid)
+            if game.song_complete:
+                break
+        samples.setdefault(f"gameplay_update[{label(name)}]", []).append(statistics.mean(update_times))
+        samples.setdefault(f"gameplay_draw[{label(name)}]", []).append(statistics.mean(draw_times))
+
+
+def bench_visuals(samples):
+    from game.settings import WHITE, NEON_BLUE
+    from game.visuals import create_neon_text
+
+    font = pygame.font.Font(None, 64)
+    measure(samples, "create_neon_text", lambda: create_neon_text("SELECT MAP", font, WHITE, NEON_BLUE))
+
+
+def bench_editor(samples, map_files, screen):
+    from game.map_editor.editor_screen import EditorScreen
+
+    for name in map_files:
+        editor = EditorScreen(name)
+        duration = max(editor.map_data.get_duration_ms(), 1)
+        positions = [duration * i / GRID_SAMPLES for i in range(GRID_SAMPLES)]
+
+        def draw_timeline():
+            for t in positions:
+                editor.current_time = t
+                editor._draw_grid(screen)
+
+        measure(samples, f"editor_draw_grid[{label(name)}]", draw_timeline, GRID_SAMPLES)
+
+
+def spread(runs):
+    """How noisy a benchmark's samples are: interquartile range / median.
+
+    Unlike slowest / fastest, one sample caught by a slow patch barely moves it.
+    """
+    if len(runs) < 2:
+        return 0.0
+    q1, median, q3 = statistics.quantiles(runs, n=4, method="inclusive")
+    return (q3 - q1) / median
+
+
+def run(map_files, frames, rounds=DEFAULT_ROUNDS):
+    """Time everything; returns {name: fastest sample} and {name: spread}."""
+    pygame.init()
+    screen = pygame.display.set_mode((1280, 720))
+    samples = {}
+    for _ in range(rounds):
+        bench_maps(samples, map_files)
+        bench_visuals(samples)
+        bench_gameplay(samples, map_files, screen, frames)
+        bench_editor(samples, map_files, screen)
+    pygame.quit()
+    results = {name: min(runs) for name, runs in samples.items()}
+    spreads = {name: spread(runs) for name, runs in samples.items()}
+    return results, spreads
+
+
+def compare(results, spreads, baseline, baseline_spreads, tolerance):
+    """Print each result against the baseline; return the names that got slower.
+
+    A benchmark is flagged once it is slower by more than the tolerance plus its
+    spread in the baseline run, with the spread allowance capped at the tolerance.
+    """
+    regressions = []
+    width = max(len(name) for name in results)
+    for name, value in results.items():
+        old = baseline.get(name)
+        spread = f"spread {spreads[name]:6.1%}"
+        if old:
+            change = value / old - 1
+            flag = ""
+            if change > tolerance + min(baseline_spreads.get(name, 0), tolerance):
+                flag = "  <-- SLOWER"
+                regressions.append(name)
+            print(f"{name:<{width}}  {value * 1000:10.4f} ms  {spread}  {change:+7.1%}{flag}")
+        else:
+            print(f"{name:<{width}}  {value * 1000:10.4f} ms  {spread}      (new)")
+    return regressions
+
+
+def main():
+    from game.map_manager import MAPS_DIR
+
+    parser = argparse.ArgumentParser(description="Time the game's hot paths.")
+    parser.add_argument("--save", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown before a result is flagged (0.25 = 25%%)")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES,
+                        help="gameplay frames per map per round (0 = whole song)")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="times the whole suite is run")
+    parser.add_argument("--maps", nargs="*", help="map files in game/maps (default: all)")
+    parser.add_argument("--stress", action="store_true", help="add the generated stress charts")
+    args = parser.parse_args()
+
+    map_files = args.maps or sorted(f for f in os.listdir(MAPS_DIR) if f.endswith(".json"))
+    with tempfile.TemporaryDirectory() as stress_dir:
+        if args.stress:
+            from benchmarks.stress_chart import write_presets
+            map_files = map_files + write_presets(stress_dir)
+        results, spreads = run(map_files, args.frames, args.rounds)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+    regressions = compare(results, spreads, baseline.get("results", {}), baseline.get("spread", {}), args.tolerance)
+
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump({
+                "machine": platform.platform(),
+                "python": platform.python_version(),
+                "pygame": pygame.version.ver,
+                "frames": args.frames,
+                "rounds": args.rounds,
+                "results": results,
+                "spread": spreads,
+            }, f, indent=4)
+        print(f"Saved baseline to {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} benchmark(s) slower than the baseline by more than {args.tolerance:.0%} plus their spread")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
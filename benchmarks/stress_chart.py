@@ -0,0 +1,123 @@
+"""
+Stress charts - seeded synthetic maps in the game/maps format, for scaling tests.
+
+    python benchmarks/stress_chart.py --seconds 600 --nps 30 --out "game/maps/Stress 30nps.json"
+    python benchmarks/stress_chart.py --seconds 3000 --nps 40 --holds 0.3 --chords 0.4 --lanes 1,1,2,4,4,2,1,1
+
+The same parameters and seed always give the same chart. Notes sit on a fixed
+grid; a lane is never given a note while a hold in it is still running.
+"""
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from game.settings import NUM_LANES
+
+START_MS = 2000          # First note, just after the gameplay grace period
+MAX_CHORD = 3            # Chords are 2..MAX_CHORD notes
+HOLD_MS = (200, 2000)    # Hold durations are picked uniformly from this range (ms)
+
+# Benchmark presets: name -> (seconds, notes per second, hold ratio)
+PRESETS = {
+    "Stress 10k": (500, 20, 0.1),
+    "Stress 100k": (2500, 40, 0.05),
+}
+
+
+def generate_chart(seconds, nps, hold_ratio=0.2, chord_density=0.1, lane_weights=None, seed=0, bpm=120):
+    """Build a map dict with up to seconds * nps hit objects.
+
+    Running holds take their lane out of play, so dense charts with many holds
+    come out short of that (40 nps with 20% holds fills about 70%).
+    """
+    rng = np.random.default_rng(seed)
+    weights = np.ones(NUM_LANES) if lane_weights is None else np.asarray(lane_weights, dtype=np.float64)
+    if len(weights) != NUM_LANES or weights.min() < 0 or weights.sum() <= 0:
+        raise ValueError(f"Need {NUM_LANES} non-negative lane weights")
+    weights = weights / weights.sum()
+
+    # Chords put several notes on one grid slot, so space the slots to keep the note rate
+    notes_per_slot = 1 + chord_density * ((2 + MAX_CHORD) / 2 - 1)
+    slot_ms = 1000 * notes_per_slot / nps
+    slots = int(seconds * 1000 / slot_ms)
+
+    hit_objects = []
+    lane_free_at = np.zeros(NUM_LANES)
+    for i in range(slots):
+        time = int(START_MS + i * slot_ms)
+        size = int(rng.integers(2, MAX_CHORD + 1)) if rng.random() < chord_density else 1
+
+        p = np.where(lane_free_at <= time, weights, 0)
+        if p.sum() == 0:
+            continue
+        size = min(size, int(np.count_nonzero(p)))
+        lanes = rng.choice(NUM_LANES, size=size, replace=False, p=p / p.sum())
+
+        for lane in sorted(lanes.tolist()):
+            if rng.random() < hold_ratio:
+                duration = int(rng.integers(HOLD_MS[0], HOLD_MS[1] + 1))
+                hit_objects.append({"time": time, "lane": lane, "type": "hold", "duration": duration})
+                # Leave a gap after the hold so its release and the next press don't collide
+                lane_free_at[lane] = time + duration + slot_ms
+            else:
+                hit_objects.append({"time": time, "lane": lane, "type": "beat"})
+                lane_free_at[lane] = time + 1
+
+    return {
+        "metadata": {
+            "title": f"Stress {nps:g}nps {seconds:g}s",
+            "artist": "Generated",
+            "mapper": f"stress_chart seed {seed}",
+            "difficulty": 1
+        },
+        "audio": {
+            "file": None,
+            "bpm": bpm,
+            "offset_ms": 0
+        },
+        "hit_objects": hit_objects
+    }
+
+
+def write_chart(path, chart):
+    with open(path, 'w') as f:
+        json.dump(chart, f)
+    return path
+
+
+def write_presets(directory, seed=0):
+    """Write every preset chart into directory and return their paths."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name, (seconds, nps, hold_ratio) in PRESETS.items():
+        path = os.path.join(directory, f"{name}.json")
+        paths.append(write_chart(path, generate_chart(seconds, nps, hold_ratio, seed=seed)))
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic stress chart.")
+    parser.add_argument("--seconds", type=float, default=600)
+    parser.add_argument("--nps", type=float, default=30, help="notes per second")
+    parser.add_argument("--holds", type=float, default=0.2, help="fraction of notes that are holds")
+    parser.add_argument("--chords", type=float, default=0.1, help="fraction of grid slots that are chords")
+    parser.add_argument("--lanes", help=f"{NUM_LANES} comma-separated lane weights (default: even)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="output file (default: game/maps/Stress <nps>nps <seconds>s.json)")
+    args = parser.parse_args()
+
+    weights = [float(w) for w in args.lanes.split(",")] if args.lanes else None
+    chart = generate_chart(args.seconds, args.nps, args.holds, args.chords, weights, args.seed)
+    out = args.out or os.path.join(ROOT, "game", "maps", f"{chart['metadata']['title']}.json")
+    write_chart(out, chart)
+    print(f"Wrote {len(chart['hit_objects'])} hit objects to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,28 @@
 AudioManager - Handles music playback for editor, selection, and gameplay.
 """
 import pygame
+import io
 import os
+import time
 # Define Assets Path here to avoid circular imports or redefining constantly
 ASSETS_AUDIO_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", "audio")
 
+MIXER_FREQUENCY = 44100
+MIXER_BUFFER = 512  # Samples per buffer; one buffer of audio is queued ahead of the speakers
+
+# The clock is checked against the mixer this often while playing
+RESYNC_INTERVAL_MS = 100
+# Fraction of the measured drift corrected per resync. The mixer position only
+# moves a buffer (~12 ms) at a time, so it is blended in rather than trusted outright.
+RESYNC_SMOOTHING = 0.1
+# Drift bigger than this means the mixer jumped (seek, stall); snap to it instead
+RESYNC_SNAP_MS = 100
+
+
+def _now_ms():
+    """High resolution monotonic time in ms."""
+    return time.perf_counter_ns() / 1_000_000
+
 class AudioManager:
     """Manages audio playback with seeking and time tracking."""
     
@@ -14,25 +32,45 @@ class AudioManager:
         if pygame.mixer.get_init():
             pygame.mixer.quit()
         
-        pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+        pygame.mixer.init(frequency=MIXER_FREQUENCY, size=-16, channels=2, buffer=MIXER_BUFFER)
+        
+        # Time between the mixer taking audio and it being heard
+        init = pygame.mixer.get_init()
+        frequency = init[0] if init else MIXER_FREQUENCY
+        self.output_latency = MIXER_BUFFER / frequency * 1000
 
         self.current_file = None
+        self.stream = None  # In-memory copy of the song being played, if it came preloaded
         self.is_playing = False
-        self.start_time = 0  # When playback started (in ms)
+        self.start_time = 0  # When playback started (perf counter ms)
         self.play_offset = 0  # Where in the song we started (in ms)
         self.paused_time = 0  # Time when paused
+        self.resume_offset = 0  # Where the stream stopped when paused
         
-    def load(self, audio_filename):
-        """Load an audio file from the assets/audio directory."""
-        if not audio_filename:
-            return False
+        self.mixer_offset = 0  # Song time at which the mixer's get_pos() reads 0
+        self.correction = 0.0  # Smoothed difference between our clock and the mixer
+        self.last_sync = 0
+        self.last_position = None
         
-        audio_path = os.path.join(ASSETS_AUDIO_DIR, audio_filename)
-        if not os.path.exists(audio_path):
+    def load(self, audio_filename, data=None):
+        """Load an audio file from the assets/audio directory.
+
+        `data` is the file's contents already read into memory (see game.preload);
+        the mixer then streams from that instead of the disk.
+        """
+        if not audio_filename:
             return False
         
-        
-        pygame.mixer.music.load(audio_path)
+        if data is not None:
+            # The mixer reads from the buffer while playing, so keep it alive
+            self.stream = io.BytesIO(data)
+            pygame.mixer.music.load(self.stream, os.path.splitext(audio_filename)[1][1:])
+        else:
+            audio_path = os.path.join(ASSETS_AUDIO_DIR, audio_filename)
+            if not os.path.exists(audio_path):
+                return False
+            pygame.mixer.music.load(audio_path)
+            self.stream = None
         self.current_file = audio_filename
         return True
     
@@ -43,14 +81,15 @@ class AudioManager:
         
         pygame.mixer.music.play(start=start_ms / 1000.0)
         self.is_playing = True
-        self.start_time = pygame.time.get_ticks()
-        self.play_offset = start_ms
+        self._restart_clock(start_ms)
+        self.mixer_offset = start_ms
     
     def pause(self):
         """Pause playback."""
         if self.is_playing:
             pygame.mixer.music.pause()
             self.paused_time = self.get_position()
+            self.resume_offset = self._stream_position()
             self.is_playing = False
     
     def unpause(self):
@@ -58,8 +97,7 @@ class AudioManager:
         if not self.is_playing:
             pygame.mixer.music.unpause()
             self.is_playing = True
-            self.start_time = pygame.time.get_ticks()
-            self.play_offset = self.paused_time
+            self._restart_clock(self.resume_offset)
     
     def stop(self):
         """Stop playback completely."""
@@ -68,13 +106,43 @@ class AudioManager:
         self.start_time = 0
         self.play_offset = 0
     
+    def _restart_clock(self, position):
+        self.start_time = _now_ms()
+        self.play_offset = position
+        self.correction = 0.0
+        self.last_sync = self.start_time
+        self.last_position = None
+    
+    def _stream_position(self):
+        """Song time the mixer has reached, by our clock (before output latency)."""
+        now = _now_ms()
+        if now - self.last_sync >= RESYNC_INTERVAL_MS:
+            self.last_sync = now
+            self._resync(now)
+        return self.play_offset + (now - self.start_time) + self.correction
+    
+    def _resync(self, now):
+        """Pull the clock towards the mixer's own playback position."""
+        mixer_pos = pygame.mixer.music.get_pos()
+        if mixer_pos < 0:
+            return
+        drift = (self.mixer_offset + mixer_pos) - (self.play_offset + (now - self.start_time) + self.correction)
+        if abs(drift) > RESYNC_SNAP_MS:
+            self.correction += drift
+        else:
+            self.correction += drift * RESYNC_SMOOTHING
+    
     def get_position(self):
-        """Get current playback position in milliseconds."""
+        """Get current playback position (as heard) in milliseconds."""
         if not self.is_playing:
             return self.paused_time
         
-        elapsed = pygame.time.get_ticks() - self.start_time
-        return self.play_offset + elapsed
+        position = self._stream_position() - self.output_latency
+        # Smoothing can nudge the clock back a little; never let song time run backwards
+        if self.last_position is not None and position < self.last_position:
+            position = self.last_position
+        self.last_position = position
+        return position
     
     def seek(self, time_ms):
         """Seek to a specific time in the song."""
@@ -84,6 +152,7 @@ class AudioManager:
             self.play(time_ms)
         else:
             self.paused_time = time_ms
+            self.resume_offset = time_ms
 
 
 # Global instance
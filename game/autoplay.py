@@ -0,0 +1,49 @@
+"""
+Autoplay - key presses for a chart as a bot would play them.
+"""
+import random
+from game.settings import NUM_LANES, AUTOPLAY_TAP_MS
+from game.map_manager import TYPE_HOLD
+from game.simulation import GRACE_MS
+
+
+def autoplay_inputs(chart, jitter_ms=0, seed=0):
+    """Inputs (song time, lane, is_down) that play every note of a chart, in time order.
+
+    Presses land within +-jitter_ms of each note (seeded, so a run can be repeated).
+    A key is always let go before its lane is pressed again.
+    """
+    rng = random.Random(seed)
+    start = chart.index_at(GRACE_MS)  # Notes in the grace period never spawn
+    times = chart.times.tolist()
+    lanes = chart.lanes.tolist()
+    
+    # Hit time of the next note in the same lane, for every note
+    next_in_lane = [float("inf")] * len(times)
+    following = [float("inf")] * NUM_LANES
+    for i in range(len(times) - 1, start - 1, -1):
+        next_in_lane[i] = following[lanes[i]]
+        following[lanes[i]] = times[i]
+    
+    inputs = []
+    lane_free = [float("-inf")] * NUM_LANES  # When each lane's key was last let go
+    for i in range(start, len(times)):
+        lane = lanes[i]
+        t = times[i]
+        if jitter_ms:
+            t += rng.uniform(-jitter_ms, jitter_ms)
+        t = max(t, lane_free[lane])
+        
+        if chart.types[i] == TYPE_HOLD:
+            # Holds are kept down until just past their tail, however early the press
+            up = times[i] + float(chart.durations[i]) + 1
+        else:
+            up = t + AUTOPLAY_TAP_MS
+        # Let go before the next note in this lane could be pressed
+        up = max(t, min(up, next_in_lane[i] - jitter_ms - 1))
+        lane_free[lane] = up
+        
+        inputs.append((t, lane, True))
+        inputs.append((up, lane, False))
+    inputs.sort(key=lambda entry: entry[0])
+    return inputs
@@ -2,13 +2,16 @@ import json
 import os
 
 SCORE_FILE = "scores.json"
+SETTINGS_FILE = "settings.json"
 
 class DataManager:
     """Manages persistent game data (scores, settings)."""
     
     def __init__(self):
         self.scores = {}
+        self.settings = {}
         self.load_scores()
+        self.load_settings()
 
     def load_scores(self):
         if os.path.exists(SCORE_FILE):
@@ -22,6 +25,26 @@ class DataManager:
         with open(SCORE_FILE, 'w') as f:
             json.dump(self.scores, f, indent=4)
 
+    def load_settings(self):
+        if os.path.exists(SETTINGS_FILE):
+            with open(SETTINGS_FILE, 'r') as f:
+                self.settings = json.load(f)
+        else:
+            self.settings = {}
+
+    def save_settings(self):
+        """Save settings to JSON file."""
+        with open(SETTINGS_FILE, 'w') as f:
+            json.dump(self.settings, f, indent=4)
+
+    def get_setting(self, key, default=None):
+        return self.settings.get(key, default)
+
+    def set_setting(self, key, value):
+        """Change a setting and save it straight away."""
+        self.settings[key] = value
+        self.save_settings()
+
     def get_score(self, song_id):
         """Get best score data for a song."""
         return self.scores.get(str(song_id), {
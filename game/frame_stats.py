@@ -0,0 +1,129 @@
+"""
+Frame stats - per-stage frame timing and allocation counts, with an overlay (F3).
+
+Timing is always recorded (a few perf_counter calls per frame); the overlay text
+is only re-rendered a couple of times a second, so it can stay on in real sessions.
+"""
+import time
+import numpy as np
+import pygame
+from game.settings import NEON_BLUE, WHITE, GRAY
+
+STAGES = ("events", "update", "draw", "flip")
+HISTORY = 300       # Frames kept for the rolling percentiles (~5 s at 60 FPS)
+REFRESH_MS = 500    # How often the overlay text is re-rendered
+
+OVERLAY_POS = (10, 70)
+OVERLAY_WIDTH = 340
+OVERLAY_BG = (10, 14, 26)
+
+
+class AllocationCounter:
+    """Counts surfaces the game's draw paths report making with `add`.
+
+    The gameplay draw path (HUD, sprite and layer caches, buttons, overlays) reports
+    every surface it makes, so on gameplay screens the count is complete.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def add(self, count=1):
+        self.count += count
+
+    def take(self):
+        """Surfaces created since the last call."""
+        count = self.count
+        self.count = 0
+        return count
+
+
+allocation_counter = AllocationCounter()
+
+
+class FrameStats:
+    """Rolling record of where each frame's time went, plus the overlay that shows it."""
+
+    def __init__(self, visible=False):
+        self.visible = visible
+        # One row per frame: time in each stage, then the total (ms)
+        self.times = np.zeros((HISTORY, len(STAGES) + 1))
+        self.frames = 0
+        self.row = np.zeros(len(STAGES) + 1)
+        self.stage_start = 0
+        self.frame_start = 0
+
+        self.notes = 0
+        self.texts = 0
+        self.playing = False  # Gameplay screen, whose draw path reports its surfaces
+        self.allocations = np.zeros(HISTORY, dtype=np.int32)
+
+        self.font = None
+        self.overlay = None
+        self.last_render = 0
+
+    def begin_frame(self):
+        self.frame_start = self.stage_start = time.perf_counter()
+
+    def mark(self, stage):
+        """End the named stage of the current frame."""
+        now = time.perf_counter()
+        self.row[STAGES.index(stage)] = (now - self.stage_start) * 1000
+        self.stage_start = now
+
+    def end_frame(self, screen):
+        row = self.frames % HISTORY
+        self.row[-1] = (time.perf_counter() - self.frame_start) * 1000
+        self.times[row] = self.row
+        # Counts of what the screen is juggling this frame
+        sim = getattr(screen, "sim", None)
+        self.notes = sim.note_batch.count if sim else 0
+        self.playing = sim is not None
+        allocations = allocation_counter.take()
+        self.allocations[row] = allocations if self.playing else 0
+        self.frames += 1
+        self.texts = len(getattr(screen, "floating_texts", ()))
+
+    def toggle(self):
+        self.visible = not self.visible
+
+    def draw(self, surface):
+        """Blit the overlay and return the rect it covers."""
+        now = time.perf_counter() * 1000
+        if self.overlay is None or now - self.last_render >= REFRESH_MS:
+            self.last_render = now
+            self.overlay = self._render()
+        return surface.blit(self.overlay, OVERLAY_POS)
+
+    def _render(self):
+        if self.font is None:
+            self.font = pygame.font.Font(None, 20)
+        font = self.font
+
+        # Table of stage timings: name column, then right-aligned numbers
+        rows = [(["ms", "p50", "p95", "p99", "worst"], GRAY)]
+        filled = self.times[:min(self.frames, HISTORY)]
+        if len(filled):
+            p50, p95, p99 = np.percentile(filled, (50, 95, 99), axis=0)
+            worst = filled.max(axis=0)
+            for i, name in enumerate(STAGES + ("frame",)):
+                cells = [name] + [f"{v[i]:.2f}" for v in (p50, p95, p99, worst)]
+                rows.append((cells, NEON_BLUE if name == "frame" else WHITE))
+        last = self.allocations[(self.frames - 1) % HISTORY] if self.frames else 0
+        counts = f"notes {self.notes}   texts {self.texts}"
+        if self.playing:
+            # Menus don't report their surfaces, so the figure would be meaningless there
+            counts += f"   surfaces {last} (max {self.allocations.max()})"
+
+        name_w, col_w, line_h = 60, 55, font.get_linesize()
+        # Fixed size and opaque, so redrawing it over itself never needs the screen underneath
+        overlay = pygame.Surface((OVERLAY_WIDTH, line_h * 7 + 12))
+        overlay.fill(OVERLAY_BG)
+        for r, (cells, color) in enumerate(rows):
+            y = 6 + r * line_h
+            overlay.blit(font.render(cells[0], True, color), (8, y))
+            for c, text in enumerate(cells[1:]):
+                cell = font.render(text, True, color)
+                overlay.blit(cell, (8 + name_w + (c + 1) * col_w - cell.get_width(), y))
+        overlay.blit(font.render(counts, True, WHITE), (8, 6 + len(rows) * line_h))
+        return overlay
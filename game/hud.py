@@ -0,0 +1,72 @@
+"""
+HUD components - cached renders that only redraw when the shown value changes.
+"""
+import math
+import pygame
+from game.frame_stats import allocation_counter
+
+
+class GlyphAtlas:
+    """Pre-rendered glyphs of one font and color, composed into strings without Font.render."""
+    
+    def __init__(self, font, color, chars="0123456789.%x"):
+        self.glyphs = {c: font.render(c, True, color) for c in chars}
+        # Kerned advance for every glyph pair, so composed strings match Font.render spacing
+        self.advances = {
+            (a, b): font.size(a + b)[0] - font.size(b)[0] for a in chars for b in chars
+        }
+        self.height = max(g.get_height() for g in self.glyphs.values())
+    
+    def render(self, text):
+        xs = [0]
+        for pair in zip(text, text[1:]):
+            xs.append(xs[-1] + self.advances[pair])
+        width = xs[-1] + self.glyphs[text[-1]].get_width()
+        surf = pygame.Surface((width, self.height), pygame.SRCALPHA)
+        for c, x in zip(text, xs):
+            surf.blit(self.glyphs[c], (x, 0))
+        return surf
+
+
+class HudValue:
+    """A HUD element that re-renders only when its displayed value changes."""
+    
+    def __init__(self, render):
+        self.render = render  # value -> Surface
+        self.value = None
+        self.surface = None
+    
+    def get(self, value):
+        if self.surface is None or value != self.value:
+            self.value = value
+            self.surface = self.render(value)
+            allocation_counter.add()
+        return self.surface
+
+
+class ProgressPie:
+    """Song progress pie, pre-rendered at a fixed number of steps."""
+    
+    def __init__(self, radius, color, steps=72):
+        self.steps = steps
+        self.frames = [None] + [self._render(radius, color, i / steps) for i in range(1, steps + 1)]
+    
+    def get(self, progress):
+        """Surface for the given progress (0..1), or None when nothing is filled yet."""
+        step = int(min(max(progress, 0), 1) * self.steps)
+        return self.frames[step]
+    
+    @staticmethod
+    def _render(r, color, progress):
+        pie_s = pygame.Surface((r*2, r*2), pygame.SRCALPHA)
+        points = [(r, r)]
+        start_angle = -90
+        end_angle = start_angle + (360 * progress)
+        for ang in range(int(start_angle), int(end_angle), 10):
+            rad = math.radians(ang)
+            points.append((r + math.cos(rad) * r, r + math.sin(rad) * r))
+        rad = math.radians(end_angle)
+        points.append((r + math.cos(rad) * r, r + math.sin(rad) * r))
+        if len(points) > 2:
+            pygame.draw.polygon(pie_s, color, points)
+        return pie_s
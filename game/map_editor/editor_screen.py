@@ -5,11 +5,11 @@ import pygame
 import math
 from game.settings import (
     SCREEN_WIDTH, SCREEN_HEIGHT,
-    SLATE_NAVY, NEON_BLUE, WHITE, DARK_SLATE, GRAY,
+    NEON_BLUE, WHITE, DARK_SLATE, GRAY,
     NUM_LANES, LANE_WIDTH, LANE_SPACING, PLAYFIELD_X,
     LANE_LETTERS
 )
-from game.ui import Button, draw_grid_background, InputField, Dropdown
+from game.ui import Button, draw_background, InputField, Dropdown
 from game.map_manager import MapManager
 from game.audio_manager import audio_manager
 
@@ -181,8 +181,7 @@ class EditorScreen:
             self.save_message_timer -= dt
 
     def draw(self, surface):
-        surface.fill(SLATE_NAVY)
-        draw_grid_background(surface, SCREEN_WIDTH, SCREEN_HEIGHT)
+        draw_background(surface)
         
         # Draw Main Grid
         self._draw_grid(surface)
@@ -5,9 +5,9 @@ import pygame
 import os
 from game.settings import (
     SCREEN_WIDTH, SCREEN_HEIGHT,
-    SLATE_NAVY, NEON_BLUE, WHITE, DARK_SLATE, GRAY
+    NEON_BLUE, WHITE, DARK_SLATE, GRAY
 )
-from game.ui import Button, Panel, draw_grid_background
+from game.ui import Button, Panel, draw_background
 from game.map_manager import MapManager, MAPS_DIR
 from game.visuals import create_neon_text, draw_star
 from game.audio_manager import audio_manager
@@ -236,8 +236,7 @@ class MapSelectScreen:
             self.message_timer -= dt
     
     def draw(self, surface):
-        surface.fill(SLATE_NAVY)
-        draw_grid_background(surface, SCREEN_WIDTH, SCREEN_HEIGHT)
+        draw_background(surface)
         
         title_text = "NEW MAP: SELECT AUDIO" if self.state == STATE_IMPORT else "MAP EDITOR"
         t_surf = create_neon_text(title_text, self.title_font, WHITE, NEON_BLUE)
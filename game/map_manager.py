@@ -1,18 +1,92 @@
 """
 Map Manager - Handles loading, saving, and validating beatmap JSON files.
+
+Loaded charts are also compiled to a binary cache next to the JSON
+("<map>.chart"), which later loads memory-map instead of parsing:
+    b"QCHC", version (u8), lossless (u8), source mtime_ns (i64), source size (i64),
+    source hash (16 bytes), header length (u32), hit object count (u64),
+    header JSON ({"metadata", "audio"}), padding to 8 bytes,
+    then the columns: times (f64), durations (f32), lanes (i8), types (i8)
 """
+import hashlib
 import json
 import os
+import struct
+import numpy as np
 
 MAPS_DIR = os.path.join(os.path.dirname(__file__), "maps")
 
+# Hit object type codes used by the columnar chart
+TYPE_BEAT = 0
+TYPE_HOLD = 1
+
+CACHE_EXT = ".chart"
+CACHE_MAGIC = b"QCHC"
+CACHE_VERSION = 1
+CACHE_HEADER = struct.Struct("<4sBBqq16sIQ")
+
+# What list_maps knows about each map file, so only new or changed files get parsed
+LIBRARY_INDEX = "library.idx"
+LIBRARY_VERSION = 1
+
+# Map files are read this far for their header before falling back to the whole file
+HEADER_READ_SIZE = 64 * 1024
+
+
+class ChartColumns:
+    """Compact columnar form of a chart: one typed array per hit object field."""
+    
+    def __init__(self, hit_objects):
+        count = len(hit_objects)
+        self.times = np.fromiter((o.get("time", 0) for o in hit_objects), dtype=np.float64, count=count)
+        self.lanes = np.fromiter((o.get("lane", 0) for o in hit_objects), dtype=np.int8, count=count)
+        self.types = np.fromiter(
+            (TYPE_HOLD if o.get("type") == "hold" else TYPE_BEAT for o in hit_objects),
+            dtype=np.int8, count=count
+        )
+        self.durations = np.fromiter((o.get("duration", 0) for o in hit_objects), dtype=np.float32, count=count)
+
+    @classmethod
+    def from_arrays(cls, times, lanes, types, durations):
+        chart = cls.__new__(cls)
+        chart.times = times
+        chart.lanes = lanes
+        chart.types = types
+        chart.durations = durations
+        return chart
+
+    def to_hit_objects(self):
+        """Rebuild the hit object dicts the columns were made from."""
+        hit_objects = []
+        for time, lane, kind, duration in zip(self.times.tolist(), self.lanes.tolist(),
+                                              self.types.tolist(), self.durations.tolist()):
+            obj = {"time": int(time) if time.is_integer() else time, "lane": lane}
+            if kind == TYPE_HOLD:
+                obj["type"] = "hold"
+                obj["duration"] = int(duration) if duration.is_integer() else duration
+            else:
+                obj["type"] = "beat"
+            hit_objects.append(obj)
+        return hit_objects
+    
+    def __len__(self):
+        return len(self.times)
+    
+    def index_at(self, time_ms):
+        """Index of the first hit object at or after time_ms (times are sorted)."""
+        return int(np.searchsorted(self.times, time_ms, side="left"))
+
 class MapData:
-    """Represents a loaded beatmap."""
+    """Represents a loaded beatmap.
+
+    Built from a compiled chart, `hit_objects` is only made (by `load_hit_objects`)
+    the first time something asks for it. Built from just the header, the whole
+    body (chart and hit objects) comes from `load_body` on first use.
+    """
     
-    def __init__(self, data: dict):
+    def __init__(self, data: dict, chart=None, load_hit_objects=None, load_body=None):
         self.metadata = data.get("metadata", {})
         self.audio = data.get("audio", {})
-        self.hit_objects = data.get("hit_objects", [])
         
         # Convenience accessors
         self.title = self.metadata.get("title", "Untitled")
@@ -24,20 +98,166 @@ class MapData:
         self.offset_ms = self.audio.get("offset_ms", 0)
         self.audio_file = self.audio.get("file", None)
         
-        # Sort hit objects by time
-        self.hit_objects.sort(key=lambda x: x.get("time", 0))
+        self._load_body = load_body
+        self._hit_objects = None
+        self._chart = chart
+        self._load_hit_objects = load_hit_objects
+        if load_body is None and chart is None:
+            self._hit_objects = data.get("hit_objects", [])
+            # Sort hit objects by time
+            self._hit_objects.sort(key=lambda x: x.get("time", 0))
+            # Columnar copy for gameplay, built once per load
+            self._chart = ChartColumns(self._hit_objects)
+
+    def _take_body(self):
+        body = self._load_body()
+        self._load_body = None
+        self._chart = body._chart
+        self._hit_objects = body._hit_objects
+        self._load_hit_objects = body._load_hit_objects
+
+    @property
+    def chart(self):
+        if self._chart is None:
+            self._take_body()
+        return self._chart
+
+    @property
+    def hit_objects(self):
+        if self._hit_objects is None:
+            if self._chart is None:
+                self._take_body()
+            if self._hit_objects is None:
+                self._hit_objects = (self._load_hit_objects or self._chart.to_hit_objects)()
+        return self._hit_objects
         
     def get_duration_ms(self):
         """Get total duration based on last hit object."""
-        if not self.hit_objects:
+        chart = self.chart
+        if not len(chart):
             return 0
-        last = self.hit_objects[-1]
-        end_time = last.get("time", 0)
-        if last.get("type") == "hold":
-            end_time += last.get("duration", 0)
+        end_time = float(chart.times[-1])
+        if chart.types[-1] == TYPE_HOLD:
+            end_time += float(chart.durations[-1])
         return end_time + 1000  # Add 1s buffer
 
 
+def _cache_path(filepath):
+    return os.path.splitext(filepath)[0] + CACHE_EXT
+
+
+def _read_sorted_hit_objects(filepath):
+    with open(filepath, 'r') as f:
+        hit_objects = json.load(f).get("hit_objects", [])
+    hit_objects.sort(key=lambda x: x.get("time", 0))
+    return hit_objects
+
+
+def read_map_header(filepath):
+    """The top-level fields of a map file that come before "hit_objects", and whether
+    that covered both "metadata" and "audio". The hit objects themselves are not parsed."""
+    with open(filepath, 'r') as f:
+        text = f.read(HEADER_READ_SIZE)
+        for attempt in range(2):
+            try:
+                header = _decode_header(text)
+                return header, "metadata" in header and "audio" in header
+            except ValueError:
+                if attempt:
+                    raise
+                text += f.read()  # Header didn't fit; use the whole file
+
+
+def _decode_header(text):
+    decoder = json.JSONDecoder()
+    skip = json.decoder.WHITESPACE.match
+    header = {}
+    pos = skip(text, 0).end()
+    if text[pos:pos + 1] != "{":
+        raise ValueError("Not a JSON object")
+    pos += 1
+    while True:
+        pos = skip(text, pos).end()
+        if text[pos:pos + 1] == "}":
+            return header
+        key, pos = decoder.raw_decode(text, pos)
+        pos = skip(text, pos).end()
+        if text[pos:pos + 1] != ":":
+            raise ValueError("Expected ':'")
+        pos = skip(text, pos + 1).end()
+        if key == "hit_objects":
+            return header
+        header[key], pos = decoder.raw_decode(text, pos)
+        pos = skip(text, pos).end()
+        if text[pos:pos + 1] == ",":
+            pos += 1
+
+
+def load_compiled_map(filepath):
+    """MapData from the compiled cache of a map file, or None if it is missing or stale."""
+    try:
+        stat = os.stat(filepath)
+        mm = np.memmap(_cache_path(filepath), dtype=np.uint8, mode='r')
+        magic, version, lossless, mtime_ns, size, digest, header_len, count = CACHE_HEADER.unpack_from(mm)
+    except (OSError, ValueError, struct.error):
+        return None
+    if magic != CACHE_MAGIC or version != CACHE_VERSION or size != stat.st_size:
+        return None
+    if mtime_ns != stat.st_mtime_ns:
+        # Touched but maybe not changed (copied, checked out): trust it if the contents match
+        with open(filepath, 'rb') as f:
+            if hashlib.blake2b(f.read(), digest_size=16).digest() != digest:
+                return None
+        try:
+            with open(_cache_path(filepath), 'r+b') as f:
+                f.write(CACHE_HEADER.pack(magic, version, lossless, stat.st_mtime_ns, size, digest, header_len, count))
+        except OSError:
+            pass
+
+    pos = CACHE_HEADER.size
+    columns_start = (pos + header_len + 7) & ~7
+    if len(mm) != columns_start + count * 14:  # 8 + 4 + 1 + 1 bytes per hit object
+        return None
+    header = json.loads(bytes(mm[pos:pos + header_len]))
+    pos = columns_start
+    columns = []
+    for dtype in (np.float64, np.float32, np.int8, np.int8):
+        end = pos + count * np.dtype(dtype).itemsize
+        columns.append(np.asarray(mm[pos:end]).view(dtype))
+        pos = end
+    times, durations, lanes, types = columns
+    chart = ChartColumns.from_arrays(times, lanes, types, durations)
+
+    # Objects with fields the columns don't keep have to come from the JSON
+    load_hit_objects = None if lossless else (lambda: _read_sorted_hit_objects(filepath))
+    return MapData(header, chart, load_hit_objects)
+
+
+def compile_map(filepath, source, stat, map_data):
+    """Write the compiled cache for a map file. `source` is the bytes it was parsed from."""
+    chart = map_data.chart
+    header = json.dumps({"metadata": map_data.metadata, "audio": map_data.audio}).encode("utf-8")
+    lossless = chart.to_hit_objects() == map_data.hit_objects
+    out = bytearray(CACHE_HEADER.pack(
+        CACHE_MAGIC, CACHE_VERSION, lossless, stat.st_mtime_ns, stat.st_size,
+        hashlib.blake2b(source, digest_size=16).digest(), len(header), len(chart)
+    ))
+    out += header
+    out += bytes(-len(out) % 8)
+    for column, dtype in ((chart.times, np.float64), (chart.durations, np.float32),
+                          (chart.lanes, np.int8), (chart.types, np.int8)):
+        out += np.ascontiguousarray(column, dtype=dtype).tobytes()
+
+    # Write aside and swap in, so a half-written cache is never read
+    path = _cache_path(filepath)
+    try:
+        with open(path + ".tmp", 'wb') as f:
+            f.write(out)
+        os.replace(path + ".tmp", path)
+    except OSError:
+        pass  # The cache is only a speed-up
+
+
 class MapManager:
     """Handles I/O for beatmap files."""
     
@@ -46,28 +266,90 @@ class MapManager:
         os.makedirs(self.maps_dir, exist_ok=True)
     
     def list_maps(self):
-        """List all available beatmaps."""
+        """List all available beatmaps.
+
+        Entries come from the library index; a file is only loaded again when its
+        size or modification time has changed since it was indexed.
+        """
+        index_path = os.path.join(self.maps_dir, LIBRARY_INDEX)
+        try:
+            with open(index_path, 'r') as f:
+                index = json.load(f)
+            if index.get("version") != LIBRARY_VERSION:
+                index = {}
+        except (OSError, ValueError):
+            index = {}
+        known = index.get("maps", {})
+
+        entries = {}
+        changed = False
+        with os.scandir(self.maps_dir) as it:
+            for item in it:
+                if not item.name.endswith(".json"):
+                    continue
+                stat = item.stat()
+                entry = known.get(item.name)
+                if entry is None or entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+                    entry = self._index_entry(item.name, stat)
+                    changed = True
+                entries[item.name] = entry
+        if changed or len(entries) != len(known):
+            self._save_index(index_path, entries)
+
         maps = []
-        for filename in os.listdir(self.maps_dir):
-            if filename.endswith(".json"):
-                filepath = os.path.join(self.maps_dir, filename)
-                with open(filepath, 'r') as f:
-                    data = json.load(f)
-                    maps.append({
-                        "filename": filename,
-                        "path": filepath,
-                        "title": data.get("metadata", {}).get("title", filename),
-                        "difficulty": data.get("metadata", {}).get("difficulty", 0),
-                        "artist": data.get("metadata", {}).get("artist", "Unknown")
-                    })
+        for filename, entry in entries.items():
+            info = {key: value for key, value in entry.items() if key not in ("mtime_ns", "size")}
+            info["filename"] = filename
+            info["path"] = os.path.join(self.maps_dir, filename)
+            maps.append(info)
         return sorted(maps, key=lambda x: x["difficulty"])
+
+    def _index_entry(self, filename, stat):
+        map_data = self.load_map(filename)
+        return {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "title": map_data.metadata.get("title", filename),
+            "difficulty": map_data.metadata.get("difficulty", 0),
+            "artist": map_data.metadata.get("artist", "Unknown"),
+            "notes": len(map_data.chart),
+            "duration_ms": map_data.get_duration_ms(),
+            "bpm": map_data.bpm,
+        }
+
+    def _save_index(self, index_path, entries):
+        try:
+            with open(index_path + ".tmp", 'w') as f:
+                json.dump({"version": LIBRARY_VERSION, "maps": entries}, f)
+            os.replace(index_path + ".tmp", index_path)
+        except OSError:
+            pass  # Next listing just rescans
     
     def load_map(self, filename: str):
-        """Load a beatmap from JSON file."""
+        """Load a beatmap, from its compiled cache when that is up to date."""
         filepath = os.path.join(self.maps_dir, filename)
-        with open(filepath, 'r') as f:
-            data = json.load(f)
-        return MapData(data)
+        map_data = load_compiled_map(filepath)
+        if map_data is not None:
+            return map_data
+
+        with open(filepath, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            source = f.read()
+        map_data = MapData(json.loads(source))
+        compile_map(filepath, source, stat, map_data)
+        return map_data
+    
+    def load_map_header(self, filename: str):
+        """Load a beatmap's metadata and audio info; the hit objects load on first use."""
+        filepath = os.path.join(self.maps_dir, filename)
+        map_data = load_compiled_map(filepath)
+        if map_data is not None:
+            return map_data  # Already cheap: the chart is memory-mapped
+
+        header, complete = read_map_header(filepath)
+        if not complete:
+            return self.load_map(filename)
+        return MapData(header, load_body=lambda: self.load_map(filename))
     
     def save_map(self, filename: str, map_data: dict):
         """Save a beatmap to JSON file."""
@@ -1,108 +1,364 @@
 import pygame
+import numpy as np
+from game.frame_stats import allocation_counter
 from game.settings import (
-    LANE_LETTERS, NOTE_RADIUS, HIT_LINE_Y, NEON_BLUE, WHITE, HIT_WINDOW
+    LANE_LETTERS, NOTE_RADIUS, HIT_LINE_Y, NEON_BLUE, WHITE, GRAY,
+    SCREEN_HEIGHT, MISS_WINDOW_MS
 )
 
+# Released holds further below the hit line than this are gone
+DESPAWN_Y = HIT_LINE_Y + 80
+
+
+# Note sprite states
+NOTE_NORMAL = 0
+NOTE_HELD = 1
+NOTE_DIMMED = 2
+
+
+class NoteSprites:
+    """Note appearance pre-rasterized once into a sprite sheet.
+
+    One cell per (lane letter, state); drawing a note is a single blit of its cell.
+    """
+    SIZE = (NOTE_RADIUS + 8) * 2  # Room for the outer glow ring
+    sheet = None
+    cells = {}
+    
+    @classmethod
+    def prepare(cls):
+        if cls.sheet is None:
+            cls._build()
+    
+    @classmethod
+    def blit(cls, surface, letter, state, center):
+        if cls.sheet is None:
+            cls._build()
+        half = cls.SIZE // 2
+        surface.blit(cls.sheet, (center[0] - half, center[1] - half), cls.cells[(letter, state)])
+    
+    @classmethod
+    def _build(cls):
+        size = cls.SIZE
+        states = (NOTE_NORMAL, NOTE_HELD, NOTE_DIMMED)
+        sheet = pygame.Surface((size * len(LANE_LETTERS), size * len(states)), pygame.SRCALPHA)
+        font = pygame.font.Font(None, 32)
+        
+        for col, letter in enumerate(LANE_LETTERS):
+            for row, state in enumerate(states):
+                cell = pygame.Rect(col * size, row * size, size, size)
+                cls._draw_cell(sheet.subsurface(cell), font, letter, state)
+                cls.cells[(letter, state)] = cell
+        # The sheet, plus a subsurface and a text render per cell
+        allocation_counter.add(1 + 2 * len(cls.cells))
+        
+        if pygame.display.get_surface() is not None:
+            sheet = sheet.convert_alpha()
+            allocation_counter.add()
+        cls.sheet = sheet
+    
+    @staticmethod
+    def _draw_cell(cell, font, letter, state):
+        c = NOTE_RADIUS + 8
+        center = (c, c)
+        
+        if state == NOTE_HELD:
+            pygame.draw.circle(cell, WHITE, center, NOTE_RADIUS, 2)
+            return
+        
+        if state == NOTE_NORMAL:
+            ring, fill, text = NEON_BLUE, NEON_BLUE, WHITE
+            for i in range(2):
+                pygame.draw.circle(cell, (*NEON_BLUE, 50-i*20), center, NOTE_RADIUS + 4 + i*4, 2)
+        else:
+            ring, fill, text = (100, 100, 100), (50, 50, 50), GRAY
+        
+        pygame.draw.circle(cell, ring, center, NOTE_RADIUS, 3)
+        pygame.draw.circle(cell, fill, center, NOTE_RADIUS-4)
+        
+        txt = font.render(letter, True, text)
+        cell.blit(txt, txt.get_rect(center=center))
+
+
+class HoldBodySprites:
+    """Hold trails pre-rendered once per state as end caps plus a straight middle.
+
+    Each state is one tall rounded strip: its top and bottom `RADIUS` rows are
+    the caps, and any run of rows in between stretches the body. A hold of any
+    length is drawn with at most three clipped blits and no new surfaces.
+    """
+    WIDTH = int(NOTE_RADIUS * 1.2)
+    RADIUS = WIDTH // 2
+    strips = None
+    
+    @classmethod
+    def prepare(cls):
+        if cls.strips is None:
+            cls._build()
+    
+    @classmethod
+    def blit(cls, surface, state, x, top, height):
+        """Draw a hold body of the given state covering [top, top + height)."""
+        if cls.strips is None:
+            cls._build()
+        height = int(height)
+        if height <= 0 or top >= SCREEN_HEIGHT or top + height <= 0:
+            return
+        
+        strip = cls.strips[state]
+        r = cls.RADIUS
+        left = x - cls.WIDTH // 2
+        top = int(top)
+        
+        top_h = min(r, height // 2)
+        bottom_h = min(r, height - top_h)
+        surface.blit(strip, (left, top), (0, 0, cls.WIDTH, top_h))
+        
+        # Only the visible part of the middle is blitted
+        mid_top = max(top + top_h, 0)
+        mid_bottom = min(top + height - bottom_h, SCREEN_HEIGHT)
+        if mid_bottom > mid_top:
+            surface.blit(strip, (left, mid_top), (0, r, cls.WIDTH, mid_bottom - mid_top))
+        
+        surface.blit(strip, (left, top + height - bottom_h),
+                     (0, strip.get_height() - bottom_h, cls.WIDTH, bottom_h))
+    
+    @classmethod
+    def _build(cls):
+        w, r = cls.WIDTH, cls.RADIUS
+        # Tall enough that the straight middle covers the whole playfield
+        h = SCREEN_HEIGHT + 2 * r
+        strips = {}
+        for state in (NOTE_NORMAL, NOTE_HELD, NOTE_DIMMED):
+            strip = pygame.Surface((w, h), pygame.SRCALPHA)
+            allocation_counter.add()
+            rect = strip.get_rect()
+            if state == NOTE_HELD:
+                pygame.draw.rect(strip, (200, 255, 255), rect, border_radius=r)
+                pygame.draw.rect(strip, NEON_BLUE, rect, 3, border_radius=r)
+            elif state == NOTE_DIMMED:
+                pygame.draw.rect(strip, (50, 50, 50, 80), rect, border_radius=r)
+                pygame.draw.rect(strip, (100, 100, 100), rect, 1, border_radius=r)
+            else:
+                pygame.draw.rect(strip, (*NEON_BLUE, 100), rect, border_radius=r)
+                pygame.draw.rect(strip, NEON_BLUE, rect, 2, border_radius=r)
+            if pygame.display.get_surface() is not None:
+                strip = strip.convert_alpha()
+                allocation_counter.add()
+            strips[state] = strip
+        cls.strips = strips
+
+
+class NoteBatch:
+    """Per-note state for everything on screen, kept in NumPy columns.
+
+    Each note owns one row (slot). `update` moves and classifies every note
+    with a handful of vector operations instead of one Python call per note.
+    """
+    
+    def __init__(self, capacity=128):
+        self.capacity = 0
+        self.times = np.zeros(0, dtype=np.float64)     # Hit time (ms)
+        self.lengths = np.zeros(0, dtype=np.float64)   # Hold length (px), 0 for taps
+        self.y = np.zeros(0, dtype=np.float64)
+        self.in_use = np.zeros(0, dtype=bool)
+        self.active = np.zeros(0, dtype=bool)
+        self.missed = np.zeros(0, dtype=bool)
+        self.is_hold = np.zeros(0, dtype=bool)
+        self.being_held = np.zeros(0, dtype=bool)
+        self.was_held = np.zeros(0, dtype=bool)
+        self.notes = []   # Slot -> Note
+        self.free = []    # Unused slots
+        self.count = 0
+        self._grow(capacity)
+    
+    def _grow(self, capacity):
+        extra = capacity - self.capacity
+        for name in ("times", "lengths", "y", "in_use", "active", "missed",
+                     "is_hold", "being_held", "was_held"):
+            column = getattr(self, name)
+            setattr(self, name, np.concatenate([column, np.zeros(extra, dtype=column.dtype)]))
+        self.notes.extend([None] * extra)
+        self.free.extend(range(capacity - 1, self.capacity - 1, -1))
+        self.capacity = capacity
+    
+    def add(self, note, hit_time, y, length=0.0, is_hold=False):
+        """Give a note a row and return its slot."""
+        if not self.free:
+            self._grow(self.capacity * 2)
+        slot = self.free.pop()
+        self.times[slot] = hit_time
+        self.lengths[slot] = length
+        self.y[slot] = y
+        self.in_use[slot] = True
+        self.active[slot] = True
+        self.missed[slot] = False
+        self.is_hold[slot] = is_hold
+        self.being_held[slot] = False
+        self.was_held[slot] = False
+        self.notes[slot] = note
+        self.count += 1
+        return slot
+    
+    def place(self, current_time, note_speed):
+        """Set every note's y for current_time without judging anything."""
+        np.multiply(self.times - current_time, -note_speed / 1000.0, out=self.y)
+        self.y += HIT_LINE_Y
+    
+    def update(self, current_time, note_speed):
+        """Move every note to current_time. Returns the slots of newly missed notes."""
+        self.place(current_time, note_speed)
+        
+        live = self.in_use & self.active
+        # Unhit notes (and unhit hold heads) past the miss window are misses
+        newly_missed = live & ~self.was_held & (current_time - self.times > MISS_WINDOW_MS)
+        # Released holds just scroll away once their tail is gone
+        finished = live & self.was_held & ~self.being_held & (self.y - self.lengths > DESPAWN_Y)
+        
+        self.active[newly_missed | finished] = False
+        self.missed[newly_missed] = True
+        return np.flatnonzero(newly_missed)
+    
+    def next_deadline(self, miss_window, note_speed):
+        """Earliest song time at which `update` could miss or clear a note (inf if none)."""
+        live = self.in_use & self.active
+        unhit = live & ~self.was_held
+        released = live & self.was_held & ~self.being_held
+        deadline = np.inf
+        if unhit.any():
+            deadline = self.times[unhit].min() + miss_window
+        if released.any():
+            scroll_ms = (DESPAWN_Y - HIT_LINE_Y + self.lengths[released]) / note_speed * 1000
+            deadline = min(deadline, (self.times[released] + scroll_ms).min())
+        return deadline
+    
+    def release_inactive(self):
+        """Free the rows of notes that were hit, missed or finished and return those notes."""
+        done = np.flatnonzero(self.in_use & ~self.active)
+        released = []
+        if len(done):
+            self.in_use[done] = False
+            for slot in done.tolist():
+                released.append(self.notes[slot])
+                self.notes[slot] = None
+                self.free.append(slot)
+            self.count -= len(done)
+        return released
+    
+    def live_notes(self):
+        return [self.notes[slot] for slot in np.flatnonzero(self.in_use).tolist()]
+
+
+def _batch_field(name):
+    """Note attribute stored in its NoteBatch column."""
+    def get(self):
+        return getattr(self.batch, name)[self.slot]
+    
+    def set(self, value):
+        getattr(self.batch, name)[self.slot] = value
+    
+    return property(get, set)
+
 
 class Note:
     """Standard failing note."""
-    FONT = None
+    __slots__ = ("lane", "letter", "time", "hit", "batch", "slot")
+    
+    is_hold = False
+    length = 0.0
+    
+    y = _batch_field("y")
+    active = _batch_field("active")
+    missed = _batch_field("missed")
 
-    def __init__(self, lane, note_speed, spawn_y=0):
+    def __init__(self, batch, lane, hit_time, spawn_y=0):
+        self.reset(batch, lane, hit_time, spawn_y)
+    
+    def reset(self, batch, lane, hit_time, spawn_y=0):
+        """(Re)initialise the note, so pooled instances can be reused."""
         self.lane = lane
         self.letter = LANE_LETTERS[lane]
-        
-        if Note.FONT is None:
-            Note.FONT = pygame.font.Font(None, 32)
-        self.font = Note.FONT
-        
-        self.y = float(spawn_y)
-        self.speed = note_speed
-        self.active = True
+        self.time = hit_time  # Song time (ms) the note reaches the hit line
         self.hit = False
-        self.missed = False
-        self.is_hold = False
-
-    def update(self, dt):
-        if self.active:
-            self.y += self.speed * dt
-            if self.y > HIT_LINE_Y + HIT_WINDOW + 20: 
-                self.active = False
-                self.missed = True
+        self.batch = batch
+        self.slot = batch.add(self, hit_time, float(spawn_y), self.length, self.is_hold)
 
     def draw(self, surface, x):
         if not self.active: return
-        
-        center = (x, self.y)
-        for i in range(2):
-            r = NOTE_RADIUS + 4 + i*4
-            s = pygame.Surface((int(r*2), int(r*2)), pygame.SRCALPHA)
-            pygame.draw.circle(s, (*NEON_BLUE, 50-i*20), (r, r), r, 2)
-            surface.blit(s, (x-r, self.y-r))
-            
-        pygame.draw.circle(surface, NEON_BLUE, center, NOTE_RADIUS, 3)
-        pygame.draw.circle(surface, (*NEON_BLUE, 40), center, NOTE_RADIUS-4)
-        
-        txt = self.font.render(self.letter, True, WHITE)
-        surface.blit(txt, txt.get_rect(center=(int(x), int(self.y))))
+        NoteSprites.blit(surface, self.letter, NOTE_NORMAL, (x, self.y))
 
-    def check_hit(self, hit_y, tolerance):
-        return self.active and abs(self.y - hit_y) <= tolerance
+    def check_hit(self, time, window):
+        """Whether a press at song time `time` (ms) is within `window` ms of this note."""
+        return self.active and abs(time - self.time) <= window
 
 class HoldNote(Note):
     """Note that must be held for a duration."""
-    def __init__(self, lane, note_speed, length_px, spawn_y=0):
-        super().__init__(lane, note_speed, spawn_y)
-        self.is_hold = True
+    __slots__ = ("length", "end_time", "initial_hit_offset")
+    
+    is_hold = True
+    
+    being_held = _batch_field("being_held")
+    was_held = _batch_field("was_held")
+    
+    def __init__(self, batch, lane, hit_time, duration, length_px, spawn_y=0):
+        self.reset(batch, lane, hit_time, duration, length_px, spawn_y)
+    
+    def reset(self, batch, lane, hit_time, duration, length_px, spawn_y=0):
         self.length = float(length_px)
-        self.being_held = False
-        self.was_held = False
-        self.initial_hit_offset = 0
-        
-    def update(self, dt):
-        if self.active:
-            self.y += self.speed * dt
-            
-            if not self.being_held:
-                if self.was_held:
-                    tail_y = self.y - self.length
-                    if tail_y > HIT_LINE_Y + HIT_WINDOW + 20:
-                        self.active = False
-                else:
-                    if self.y > HIT_LINE_Y + HIT_WINDOW + 20:
-                        self.active = False
-                        self.missed = True
+        self.end_time = hit_time + duration  # Song time (ms) the tail reaches the hit line
+        self.initial_hit_offset = 0  # ms between the note and the key press that caught it
+        super().reset(batch, lane, hit_time, spawn_y)
 
     def draw(self, surface, x):
         if not self.active: return
         
-        width = int(NOTE_RADIUS * 1.2)
         tail_y = self.y - self.length
         
         if self.being_held:
             if tail_y < HIT_LINE_Y:
-                rect_h = HIT_LINE_Y - tail_y
-                trail_rect = (x - width/2, tail_y, width, rect_h)
-                
-                pygame.draw.rect(surface, (200, 255, 255), trail_rect, border_radius=width//2)
-                pygame.draw.rect(surface, NEON_BLUE, trail_rect, 3, border_radius=width//2)
-                pygame.draw.circle(surface, WHITE, (x, HIT_LINE_Y), NOTE_RADIUS, 2)
+                HoldBodySprites.blit(surface, NOTE_HELD, x, tail_y, HIT_LINE_Y - tail_y)
+                NoteSprites.blit(surface, self.letter, NOTE_HELD, (x, HIT_LINE_Y))
         else:
-            trail_rect = (x - width/2, tail_y, width, self.length)
+            state = NOTE_DIMMED if self.was_held else NOTE_NORMAL
+            HoldBodySprites.blit(surface, state, x, tail_y, self.length)
             
-            color = NEON_BLUE
-            alpha = 100
-            
-            if self.was_held and not self.being_held:
-                color = (50, 50, 50) 
-                alpha = 80 
-                pygame.draw.rect(surface, (100, 100, 100), trail_rect, 1, border_radius=width//2)
+            if self.was_held:
+                NoteSprites.blit(surface, self.letter, NOTE_DIMMED, (x, self.y))
             else:
-                pygame.draw.rect(surface, color, trail_rect, 2, border_radius=width//2)
-            
-            s = pygame.Surface((width, int(self.length)), pygame.SRCALPHA)
-            pygame.draw.rect(s, (*color, alpha), s.get_rect(), border_radius=width//2)
-            surface.blit(s, (x - width//2, tail_y))
-            
-            if not self.was_held:
                 super().draw(surface, x)
+
+
+class NotePool:
+    """Recycles Note/HoldNote instances so dense streams and restarts don't allocate."""
+    
+    def __init__(self):
+        self.free_notes = []
+        self.free_holds = []
+    
+    def acquire_note(self, batch, lane, hit_time, spawn_y=0):
+        if self.free_notes:
+            note = self.free_notes.pop()
+            note.reset(batch, lane, hit_time, spawn_y)
+            return note
+        return Note(batch, lane, hit_time, spawn_y)
+    
+    def acquire_hold(self, batch, lane, hit_time, duration, length_px, spawn_y=0):
+        if self.free_holds:
+            note = self.free_holds.pop()
+            note.reset(batch, lane, hit_time, duration, length_px, spawn_y)
+            return note
+        return HoldNote(batch, lane, hit_time, duration, length_px, spawn_y)
+    
+    def release(self, notes):
+        """Take back notes that have left their batch."""
+        for note in notes:
+            note.batch = None
+            note.slot = None
+            if note.is_hold:
+                self.free_holds.append(note)
+            else:
+                self.free_notes.append(note)
+
+
+# Shared across gameplay sessions so restarts reuse the same instances
+note_pool = NotePool()
@@ -0,0 +1,79 @@
+"""
+Preload - gets a map ready to play on a background thread while it is highlighted
+in song select, so pressing PLAY doesn't stall on loading.
+
+Only file reads and chart parsing happen on the thread: pygame, SDL_ttf and the
+sprite caches aren't thread-safe, so fonts and sprites are built on the main
+thread (GameplayAssets.get and GameplayScreen.prepare_sprites, from song select).
+"""
+import os
+import threading
+import pygame
+from game.settings import LANE_WIDTH, SCREEN_HEIGHT, NEON_BLUE, WHITE
+from game.map_manager import MapManager
+from game.audio_manager import ASSETS_AUDIO_DIR
+from game.hud import GlyphAtlas
+from game.visuals import create_neon_text
+
+
+class GameplayAssets:
+    """Fonts and pre-rendered sprites GameplayScreen uses, made once and shared by every play."""
+
+    _instance = None
+
+    @classmethod
+    def get(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self.score_font = pygame.font.Font(None, 64)
+        self.combo_font = pygame.font.Font(None, 72)
+        self.small_font = pygame.font.Font(None, 24)
+        self.lane_font = pygame.font.Font(None, 28)
+        self.judge_font = pygame.font.Font(None, 40)
+        self.percent_font = pygame.font.Font(None, 48)
+        self.big_font = pygame.font.Font(None, 64)
+
+        self.score_digits = GlyphAtlas(self.score_font, WHITE)
+        self.percent_digits = GlyphAtlas(self.percent_font, NEON_BLUE)
+        self.paused_text = create_neon_text("PAUSED", self.big_font, WHITE, NEON_BLUE)
+        self.autoplay_text = self.small_font.render("AUTOPLAY", True, NEON_BLUE)
+        self.lane_flash = pygame.Surface((LANE_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        self.lane_flash.fill((*NEON_BLUE, 30))
+
+
+class GameplayPreload:
+    """One map's chart and song file (read into memory), loaded on a background thread.
+
+    The song is kept as file bytes rather than a decoded mixer.Sound: gameplay plays
+    it through mixer.music, whose stream position keeps the song clock in sync.
+    """
+
+    def __init__(self, map_file):
+        self.map_file = map_file
+        self.map_data = None
+        self.audio_data = None
+        self.error = None
+        self.done = threading.Event()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        try:
+            self.map_data = MapManager().load_map(self.map_file)
+            audio_file = self.map_data.audio_file
+            if audio_file:
+                audio_path = os.path.join(ASSETS_AUDIO_DIR, audio_file)
+                if os.path.exists(audio_path):
+                    with open(audio_path, 'rb') as f:
+                        self.audio_data = f.read()
+        except Exception as e:  # Gameplay loads the map itself and reports it there
+            self.error = e
+        finally:
+            self.done.set()
+
+    def wait(self):
+        """Block until loading has finished; True if it succeeded."""
+        self.done.wait()
+        return self.error is None
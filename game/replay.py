@@ -0,0 +1,212 @@
+"""
+Replays - compact binary recordings of a play's inputs, and seekable playback.
+
+File layout:
+    b"QRPL", version (1 byte), chart hash (16 bytes),
+    map file name (varint length + UTF-8), note speed (varint),
+    step mode (1 byte: 0 fixed steps, 1 variable steps), input count (varint),
+    then one varint per input: zigzag(time delta) << 4 | lane << 1 | is_down,
+    and for variable steps: step count (varint), then one varint per step: time delta
+
+Times are stored in INPUT_RESOLUTION_MS units, delta-encoded, so a typical
+input takes 2-3 bytes. Plays run with FIXED_TIMESTEP off keep the time of every
+frame's step too (about 2 bytes a frame), since scoring depends on them.
+Version 1 files have no step mode and were all played in fixed steps.
+"""
+import copy
+import hashlib
+import os
+import time
+from bisect import bisect_right
+from game.simulation import Simulation, START_TIME, INPUT_RESOLUTION_MS
+
+REPLAY_DIR = "replays"
+REPLAY_MAGIC = b"QRPL"
+REPLAY_VERSION = 2
+
+STEPS_FIXED = 0
+STEPS_VARIABLE = 1
+
+# Playback keeps a copy of the simulation this often (song time) for seeking
+SNAPSHOT_MS = 5000
+
+
+def chart_hash(chart):
+    """16-byte digest of a chart's hit objects; replays only match the chart they were played on."""
+    h = hashlib.blake2b(digest_size=16)
+    for column in (chart.times, chart.lanes, chart.types, chart.durations):
+        h.update(column.tobytes())
+    return h.digest()
+
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class Replay:
+    """Inputs of one play, as (song time, lane, is_down), plus what they were played on.
+
+    `step_times` are the song times the simulation was stepped to, for plays run
+    in variable steps; None for fixed steps.
+    """
+
+    def __init__(self, map_file, chart_digest, note_speed, inputs, step_times=None):
+        self.map_file = map_file
+        self.chart_digest = chart_digest
+        self.note_speed = note_speed
+        self.inputs = inputs
+        self.step_times = step_times
+
+    def encode(self):
+        out = bytearray(REPLAY_MAGIC)
+        out.append(REPLAY_VERSION)
+        out += self.chart_digest
+        name = self.map_file.encode("utf-8")
+        _write_varint(out, len(name))
+        out += name
+        _write_varint(out, int(self.note_speed))
+        out.append(STEPS_FIXED if self.step_times is None else STEPS_VARIABLE)
+        _write_varint(out, len(self.inputs))
+
+        last = 0
+        for t, lane, is_down in self.inputs:
+            units = round(t / INPUT_RESOLUTION_MS)
+            delta = units - last
+            last = units
+            zigzag = delta * 2 if delta >= 0 else -delta * 2 - 1
+            _write_varint(out, (zigzag << 4) | (lane << 1) | int(is_down))
+
+        if self.step_times is not None:
+            _write_varint(out, len(self.step_times))
+            # Steps only go forwards, so the deltas need no sign
+            last = round(START_TIME / INPUT_RESOLUTION_MS)
+            for t in self.step_times:
+                units = round(t / INPUT_RESOLUTION_MS)
+                _write_varint(out, units - last)
+                last = units
+        return bytes(out)
+
+    @classmethod
+    def decode(cls, data):
+        if data[:4] != REPLAY_MAGIC or data[4] not in (1, REPLAY_VERSION):
+            raise ValueError("Not a replay file")
+        version = data[4]
+        chart_digest = bytes(data[5:21])
+        length, pos = _read_varint(data, 21)
+        map_file = data[pos:pos + length].decode("utf-8")
+        note_speed, pos = _read_varint(data, pos + length)
+        step_mode = STEPS_FIXED
+        if version >= 2:
+            step_mode = data[pos]
+            pos += 1
+        count, pos = _read_varint(data, pos)
+
+        inputs = []
+        units = 0
+        for _ in range(count):
+            value, pos = _read_varint(data, pos)
+            zigzag = value >> 4
+            units += (zigzag >> 1) if not zigzag & 1 else -((zigzag + 1) >> 1)
+            inputs.append((units * INPUT_RESOLUTION_MS, (value >> 1) & 0x7, bool(value & 1)))
+
+        step_times = None
+        if step_mode == STEPS_VARIABLE:
+            count, pos = _read_varint(data, pos)
+            step_times = []
+            units = round(START_TIME / INPUT_RESOLUTION_MS)
+            for _ in range(count):
+                delta, pos = _read_varint(data, pos)
+                units += delta
+                step_times.append(units * INPUT_RESOLUTION_MS)
+        return cls(map_file, chart_digest, note_speed, inputs, step_times)
+
+
+def save_replay(replay):
+    """Write a replay under REPLAY_DIR and return its path."""
+    os.makedirs(REPLAY_DIR, exist_ok=True)
+    name = f"{os.path.splitext(replay.map_file)[0]}_{time.strftime('%Y%m%d_%H%M%S')}.qrp"
+    path = os.path.join(REPLAY_DIR, name)
+    with open(path, 'wb') as f:
+        f.write(replay.encode())
+    return path
+
+
+def load_replay(path):
+    with open(path, 'rb') as f:
+        return Replay.decode(f.read())
+
+
+class ReplayPlayer:
+    """Re-runs a replay through the simulation, with snapshots to seek from.
+
+    The simulation is stepped the way the play was: in fixed steps, or to each
+    recorded step time. Snapshots are taken every SNAPSHOT_MS of song time the
+    first time playback passes it, so loading is instant and seeking back never
+    replays from the start.
+    """
+
+    def __init__(self, replay, chart, difficulty=1):
+        self.replay = replay
+        self.chart = chart
+        self.difficulty = difficulty
+        self.sim = Simulation(chart, difficulty, replay.note_speed)
+        self.next_input = 0
+        self.next_step = 0
+        self.snapshots = []  # (song time, next input, next step, simulation copy)
+        self._take_snapshot()
+
+    def _copy_sim(self, sim):
+        # The chart never changes; share it instead of copying it. The step log
+        # is only for recording, so copies start without it.
+        sim_copy = copy.deepcopy(sim, {id(self.chart): self.chart, id(sim.step_log): []})
+        sim_copy.events = []
+        return sim_copy
+
+    def _take_snapshot(self):
+        self.snapshots.append((self.sim.time, self.next_input, self.next_step, self._copy_sim(self.sim)))
+
+    def _run_to(self, t):
+        inputs = self.replay.inputs
+        while self.next_input < len(inputs) and inputs[self.next_input][0] <= t:
+            self.sim.input_queue.append(inputs[self.next_input])
+            self.next_input += 1
+        steps = self.replay.step_times
+        if steps is None:
+            self.sim.advance_to(t)
+            return
+        while self.next_step < len(steps) and steps[self.next_step] <= t:
+            self.sim.step_to(steps[self.next_step])
+            self.next_step += 1
+
+    def advance_to(self, t):
+        """Play forward to song time t."""
+        while not self.sim.failed:
+            next_snapshot = START_TIME + len(self.snapshots) * SNAPSHOT_MS
+            if t < next_snapshot:
+                break
+            self._run_to(next_snapshot)
+            self._take_snapshot()
+        self._run_to(t)
+
+    def seek(self, t):
+        """Jump to song time t, forwards or backwards."""
+        times = [snapshot[0] for snapshot in self.snapshots]
+        index = max(bisect_right(times, t) - 1, 0)
+        if t < self.sim.time or index > bisect_right(times, self.sim.time) - 1:
+            _, self.next_input, self.next_step, sim = self.snapshots[index]
+            self.sim = self._copy_sim(sim)
+        self.advance_to(t)
@@ -1,30 +1,40 @@
 import pygame
-import math
+from collections import deque
 import game.settings as settings
 from game.settings import (
     SCREEN_WIDTH, SCREEN_HEIGHT,
     SLATE_NAVY, NEON_BLUE, WHITE, DARK_SLATE, GRAY,
     NUM_LANES, LANE_WIDTH, LANE_SPACING, PLAYFIELD_X, PLAYFIELD_WIDTH,
     LANE_KEYS, LANE_LETTERS,
-    NOTE_RADIUS, HIT_LINE_Y, HIT_WINDOW,
-    BASE_SCORE, COMBO_MULTIPLIER,
-    MAX_HEALTH, HEALTH_DRAIN_PER_MISS, HEALTH_GAIN_PER_HIT,
+    NOTE_RADIUS, HIT_LINE_Y,
+    MAX_HEALTH, FIXED_TIMESTEP, AUTOPLAY_JITTER_MS,
     current_map_file
 )
-from game.map_manager import MapManager
-from game.ui import draw_grid_background, draw_hit_line_glow, Button, FloatingText
-from game.note import Note, HoldNote
+from game.map_manager import MapManager, MapData
+from game.ui import draw_grid_background, draw_hit_line_glow, Button, LayerCache, JudgementSprites, floating_text_pool
+from game.note import NoteSprites, HoldBodySprites
+from game.simulation import Simulation, START_TIME, get_rank
+from game.replay import Replay, chart_hash, save_replay
+from game.autoplay import autoplay_inputs
 from game.data_manager import DataManager
-from game.visuals import create_neon_text
+from game.hud import HudValue, ProgressPie
+from game.preload import GameplayAssets
 from game.audio_manager import audio_manager
+from game.frame_stats import allocation_counter
 
 # Judgement settings
 JUDGEMENT_TIME = 0.5
+JUDGEMENT_COLORS = {
+    "PERFECT": (0, 255, 0),     # Green
+    "GREAT": (0, 150, 255),     # Blue
+    "MISS": (255, 50, 50),
+    "BREAK": (200, 200, 200),
+}
 
 class GameplayScreen:
     """Main gameplay screen."""
     
-    def __init__(self):
+    def __init__(self, map_file=None, autoplay=None, audio=True, preload=None):
         self.next_screen = None
         self.next_screen_args = None
         self.paused = False
@@ -35,52 +45,77 @@ class GameplayScreen:
         self.fail_timer = 0
         self.song_complete = False
         self.auto_end_timer = 0
+        self.replay_file = None
         self.data_manager = DataManager()
         self.map_manager = MapManager()
         
-        # Load Map
-        if settings.current_map_file:
-            self.map_data = self.map_manager.load_map(settings.current_map_file)
+        # Both calibration tests measure the player's own tap delay too. Key presses
+        # get the audio result taken off, so taps in time with the music land on the
+        # note; notes are drawn ahead by however much later the screen is than the
+        # audio, so taps in time with the screen land there as well.
+        audio_offset = self.data_manager.get_setting("audio_offset_ms", None)
+        visual_offset = self.data_manager.get_setting("visual_offset_ms", None)
+        self.input_offset = settings.INPUT_OFFSET_MS - (audio_offset or 0)
+        self.render_offset = 0
+        if visual_offset is not None:
+            self.render_offset = visual_offset - (audio_offset or 0)
+        
+        # Load Map (already done in the background if song select preloaded it)
+        map_file = map_file or settings.current_map_file
+        self.audio_data = None
+        if preload is not None and preload.map_file == map_file and preload.wait():
+            self.map_data = preload.map_data
+            self.audio_data = preload.audio_data
+        elif map_file:
+            self.map_data = self.map_manager.load_map(map_file)
         else:
             # Fallback (should not happen in normal flow)
-            self.map_data = self.map_manager.create_empty_map("No Map Loaded")
+            self.map_data = MapData(self.map_manager.create_empty_map("No Map Loaded"))
             
         self.song_title = self.map_data.title
-        self.song_id = settings.current_map_file # Use filename as ID for now
+        self.song_id = map_file # Use filename as ID for now
         
         # Audio Init
-        # Modified for 2s grace period
+        # Modified for 2s grace period: the song is opened now, during the grace
+        # period, and only started once song time reaches 0
         self.playing_audio = False
+        self.use_audio = audio
+        self.audio_loaded = False
+        if self.use_audio and self.map_data.audio_file:
+            self.audio_loaded = audio_manager.load(self.map_data.audio_file, self.audio_data)
         
-        # Spawning Logic
-        # Filter notes < 2000ms (Grace period ignore)
-        self.hit_objects = [h for h in self.map_data.hit_objects if h['time'] >= 2000]
-        self.active_notes = []
-        self.current_time = -2000 # Start 2 seconds early (Grace wait)
+        # The game rules (spawning, judgement, scoring) run headless in the simulation;
+        # this screen feeds it key presses and draws its state
         self.note_speed = 300 # pixels per second
-        self.spawn_distance = SCREEN_HEIGHT + 100        
-        # Stats
-        self.score = 0
-        self.combo = 0
-        self.max_combo = 0
-        self.health = MAX_HEALTH
+        self.sim = Simulation(self.map_data.chart, getattr(self.map_data, "difficulty", 1), self.note_speed)
+        self.current_time = START_TIME # Start 2 seconds early (Grace wait)
+        
+        # Autoplay: the bot's key presses, fed to the simulation as the song reaches them
+        self.autoplay = settings.autoplay if autoplay is None else autoplay
+        self.bot_inputs = None
+        if self.autoplay:
+            self.bot_inputs = deque(autoplay_inputs(self.map_data.chart, AUTOPLAY_JITTER_MS))
         
-        self.perfects = 0
-        self.greats = 0
-        self.misses = 0
-        self.spam_count = 0 
+        # Visuals (fonts and static sprites are shared by every play)
+        assets = GameplayAssets.get()
+        self.score_font = assets.score_font
+        self.combo_font = assets.combo_font
+        self.small_font = assets.small_font
+        self.lane_font = assets.lane_font
+        self.judge_font = assets.judge_font
+        self.percent_font = assets.percent_font
+        self.big_font = assets.big_font
         
-        # Visuals
-        self.score_font = pygame.font.Font(None, 64)
-        self.combo_font = pygame.font.Font(None, 72)
-        self.small_font = pygame.font.Font(None, 24)
-        self.lane_font = pygame.font.Font(None, 28)
-        self.judge_font = pygame.font.Font(None, 40)
-        self.percent_font = pygame.font.Font(None, 48)
-        self.big_font = pygame.font.Font(None, 64)
+        # HUD elements, re-rendered only when their value changes
+        score_digits = assets.score_digits
+        percent_digits = assets.percent_digits
+        self.hud_score = HudValue(lambda score: score_digits.render(f"{score:08d}"))
+        self.hud_accuracy = HudValue(lambda _counts: percent_digits.render(f"{self.sim.get_accuracy():.2f}%"))
+        self.hud_combo = HudValue(lambda combo: self.combo_font.render(f"{combo}x", True, WHITE))
+        self.progress_pie = ProgressPie(10, NEON_BLUE)
         
-        # Pre-render static neon texts
-        self.paused_text = create_neon_text("PAUSED", self.big_font, WHITE, NEON_BLUE)
+        self.paused_text = assets.paused_text
+        self.autoplay_text = assets.autoplay_text
         
         # PAUSE MENU BUTTONS
         cx, cy = SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2
@@ -92,8 +127,8 @@ class GameplayScreen:
             'menu': Button(cx - btn_w//2, cy + 260, btn_w, btn_h, "MAIN MENU"),
         }
         
-        self.key_pressed = [False] * NUM_LANES
         self.hit_flash = [0] * NUM_LANES
+        self.lane_flash = assets.lane_flash
         self.last_judgement = "" 
         self.judgement_timer = 0
         self.judgement_color = WHITE
@@ -112,12 +147,15 @@ class GameplayScreen:
                         audio_manager.unpause()
                     elif name == 'restart':
                         audio_manager.stop()
+                        self._save_replay()
                         self.next_screen = 'gameplay' 
                     elif name == 'select':
                         audio_manager.stop()
+                        self._save_replay()
                         self.next_screen = 'select'
                     elif name == 'menu':
                         audio_manager.stop()
+                        self._save_replay()
                         self.next_screen = 'menu'
             
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
@@ -143,61 +181,21 @@ class GameplayScreen:
             if self.paused or self.game_over or self.song_complete or self.failed: return
 
             key_name = pygame.key.name(event.key)
-            if key_name in LANE_KEYS:
-                lane = LANE_KEYS.index(key_name)
-                self.key_pressed[lane] = True
-                
-                # Check for Hit
-                hit_note = None
-                for note in self.active_notes:
-                    if note.lane == lane and note.active and not note.hit:
-                        if note.check_hit(HIT_LINE_Y, HIT_WINDOW):
-                            if note.is_hold:
-                                if not note.being_held and not note.was_held:
-                                    note.being_held = True
-                                    note.was_held = True
-                                    note.initial_hit_offset = abs(note.y - HIT_LINE_Y)
-                                    hit_note = note
-                                    break
-                            else:
-                                note.active = False
-                                note.hit = True
-                                hit_note = note
-                                break
-                
-                if hit_note:
-                    if hit_note.is_hold:
-                        self.hit_flash[lane] = 0.1
-                        self._register_hit(hit_note, lane, is_initial_hold=True)
-                    else:
-                        self._register_hit(hit_note, lane)
-                else:
-                    # Spam Punish Check
-                    nearby_note = False
-                    for note in self.active_notes:
-                        if note.lane == lane and note.active:
-                            if abs(note.y - HIT_LINE_Y) < 200:
-                                nearby_note = True
-                                break
-                    if not nearby_note:
-                        self._register_limitless_spam_punish()
+            if key_name in LANE_KEYS and not self.autoplay:
+                self.sim.press(self._input_time(), LANE_KEYS.index(key_name))
 
         elif event.type == pygame.KEYUP:
             key_name = pygame.key.name(event.key)
-            if key_name in LANE_KEYS:
-                lane = LANE_KEYS.index(key_name)
-                self.key_pressed[lane] = False
-                
-                # Release Hold Logic
-                for note in self.active_notes:
-                    if note.lane == lane and note.is_hold and note.being_held and note.active:
-                        note.being_held = False
-                        # Early release punishment
-                        self.combo = 0
-                        self.last_judgement = "BREAK"
-                        self.judgement_color = (200, 200, 200)
-                        self.judgement_timer = 0.5
-                        break 
+            if key_name in LANE_KEYS and not self.autoplay:
+                self.sim.release(self._input_time(), LANE_KEYS.index(key_name))
+
+    def _input_time(self):
+        """Song time (ms) an input event arrived at, used to judge it."""
+        if self.playing_audio and audio_manager.is_playing:
+            time = audio_manager.get_position()
+        else:
+            time = self.current_time
+        return time + self.input_offset
 
     def update(self, dt):
         if self.paused: 
@@ -212,7 +210,7 @@ class GameplayScreen:
                 self._finish_song()
             return # FREEZE everything else
 
-        if self.health <= 0 and not self.failed and not self.game_over:
+        if self.sim.failed and not self.failed and not self.game_over:
             self.failed = True
             self.fail_timer = 2.0 # Wait 2 seconds before showing result screen
             audio_manager.stop()
@@ -222,12 +220,12 @@ class GameplayScreen:
             
         # Audio Start (Grace Period End)
         if not self.playing_audio and self.current_time >= 0:
-             if self.map_data.audio_file:
-                 if audio_manager.load(self.map_data.audio_file):
+             if self.use_audio and self.map_data.audio_file:
+                 if self.audio_loaded:
                      audio_manager.play(0)
                  self.playing_audio = True
 
-        # Map Spawning Logic
+        # Song clock for this frame
         if self.playing_audio and audio_manager.is_playing:
             # Sync to audio time (more accurate)
             self.current_time = audio_manager.get_position()
@@ -235,52 +233,19 @@ class GameplayScreen:
             # Fallback or end of song
             self.current_time += dt * 1000 # Convert to ms
         
-        # Spawn notes (look ahead)
-        spawn_ahead_time = (self.spawn_distance / self.note_speed) * 1000 # ms
-        
-        while self.hit_objects and self.hit_objects[0]["time"] <= self.current_time + spawn_ahead_time:
-            obj = self.hit_objects.pop(0)
-            lane = obj["lane"]
-            # Start position off-screen based on time difference
-            time_until_hit = obj["time"] - self.current_time
-            start_y = HIT_LINE_Y - (time_until_hit / 1000.0) * self.note_speed
-            
-            if obj["type"] == "hold":
-                length_px = (obj.get("duration", 0) / 1000.0) * self.note_speed
-                new_note = HoldNote(lane, self.note_speed, length_px, spawn_y=start_y)
-            else:
-                new_note = Note(lane, self.note_speed, spawn_y=start_y)
-            
-            self.active_notes.append(new_note)
-            
-        # Update active notes
-        for note in self.active_notes:
-            note.update(dt)
-            # Check for misses (passed hit line)
-            if not note.active and note.missed:
-                 pass # Will be cleared below
-        
-        # Clear inactive/missed notes
-        missed_count = 0
-        active_list = []
-        for n in self.active_notes:
-            if n.missed:
-                missed_count += 1
-            elif n.active or (n.is_hold and (n.being_held or not n.was_held)): # Keep holds that are active or being held
-                 # Slight hack for holds: check if fully done
-                 if n.is_hold and not n.active: 
-                     pass # It's done
-                 else:
-                     active_list.append(n)
-            else:
-                pass # Normal note hit
-        self.active_notes = active_list
+        if self.bot_inputs:
+            self._feed_bot_inputs()
         
-        for _ in range(missed_count):
-            self._register_miss()
+        # Advance the game rules up to the song clock. In fixed-timestep mode this
+        # is a run of small equal steps, so scoring and judgement don't depend on FPS.
+        if FIXED_TIMESTEP:
+            self.sim.advance_to(self.current_time)
+        else:
+            self.sim.step_to(self.current_time)
+        self._show_judgements()
 
         # Check for song completion
-        if not self.hit_objects and not self.active_notes and not self.song_complete:
+        if self.sim.finished and not self.song_complete:
             self.song_complete = True
             self._save_score()
 
@@ -293,25 +258,10 @@ class GameplayScreen:
             if self.auto_end_timer > 2.0:
                  self._finish_song()
             return 
-
-        # Handle Hold Ticks
-        for lane in range(NUM_LANES):
-            if self.key_pressed[lane]:
-                # Check active notes for holds being held
-                for note in self.active_notes:
-                    if note.lane == lane and note.is_hold and note.being_held and note.active:
-                        # Check tick
-                         tail_y = note.y - note.length
-                         if tail_y >= HIT_LINE_Y:
-                             note.active = False
-                             note.hit = True
-                             self._register_hit(None, lane, is_hold_complete=True)
-                         else:
-                             # Tick
-                             self.score += 5 
-                             self.health = min(MAX_HEALTH, self.health + 0.05)
-                             self.hit_flash[lane] = 0.1
         
+        self._update_effects(dt)
+
+    def _update_effects(self, dt):
         for i in range(NUM_LANES):
             if self.hit_flash[i] > 0: self.hit_flash[i] -= dt
             
@@ -321,129 +271,80 @@ class GameplayScreen:
         # Update floating texts
         for ft in self.floating_texts:
             ft.update(dt)
+            if not ft.active:
+                floating_text_pool.release(ft)
         self.floating_texts = [ft for ft in self.floating_texts if ft.active]
 
-    def _register_hit(self, note, lane=0, is_hold_complete=False, is_initial_hold=False):
-        judgement = "PERFECT"
-        value = 0
-        color = (0, 255, 0)  # Green for Perfect
-        
-        if is_hold_complete:
-            judgement = "PERFECT"
-            value = 300
-            self.perfects += 1
-            color = (0, 255, 0)  # Green
-        elif is_initial_hold:
-            offset = note.initial_hit_offset
-            if offset < 20:
-                judgement = "PERFECT"
-                value = 300
-                self.perfects += 1
-                color = (0, 255, 0)  # Green
-            else:
-                judgement = "GREAT"
-                value = 100
-                self.greats += 1
-                color = (0, 150, 255)  # Blue
-        elif note:
-            offset = abs(note.y - HIT_LINE_Y)
-            if offset < 20: 
-                judgement = "PERFECT"
-                value = 300
-                self.perfects += 1
-                self.health = min(MAX_HEALTH, self.health + 2)
-                color = (0, 255, 0)  # Green
+    def _feed_bot_inputs(self):
+        inputs = self.bot_inputs
+        while inputs and inputs[0][0] <= self.current_time:
+            time, lane, is_down = inputs.popleft()
+            if is_down:
+                self.sim.press(time, lane)
             else:
-                judgement = "GREAT"
-                value = 100
-                self.greats += 1
-                self.health = min(MAX_HEALTH, self.health + 1)
-                color = (0, 150, 255)  # Blue
-
-        self.last_judgement = judgement
-        self.judgement_timer = JUDGEMENT_TIME
-        self.judgement_color = color
-        self.combo += 1
-        self.max_combo = max(self.max_combo, self.combo)
-        
-        # Score = Value * (Combo * DifficultyMultiplier)
-        multiplier = getattr(self.map_data, "difficulty", 1)
-        self.score += value * (self.combo * multiplier)
-        
-        # Spawn floating text at lane position
-        lane_x = PLAYFIELD_X + lane * (LANE_WIDTH + LANE_SPACING) + LANE_WIDTH // 2
-        self.floating_texts.append(FloatingText(judgement, lane_x, HIT_LINE_Y - 30, color))
+                self.sim.release(time, lane)
 
-    def _register_miss(self, lane=None):
-        self.misses += 1
-        self.combo = 0
-        self.health = max(0, self.health - HEALTH_DRAIN_PER_MISS)
-        self.last_judgement = "MISS"
-        self.judgement_color = (255, 50, 50)
-        self.judgement_timer = JUDGEMENT_TIME
+    def _show_judgements(self):
+        """Judgement text and lane flashes for what the simulation just judged."""
+        for _, lane, judgement in self.sim.events:
+            self.last_judgement = judgement
+            self.judgement_color = JUDGEMENT_COLORS[judgement]
+            self.judgement_timer = JUDGEMENT_TIME
+            if judgement == "BREAK":
+                continue
+            # Spawn floating text at lane position (misses at the center)
+            if judgement == "MISS":
+                lane_x = SCREEN_WIDTH // 2
+            else:
+                lane_x = PLAYFIELD_X + lane * (LANE_WIDTH + LANE_SPACING) + LANE_WIDTH // 2
+            self.floating_texts.append(floating_text_pool.acquire(judgement, lane_x, HIT_LINE_Y - 30, self.judgement_color))
+        self.sim.events.clear()
         
-        # Spawn floating text (center if lane unknown)
-        if lane is not None:
-            lane_x = PLAYFIELD_X + lane * (LANE_WIDTH + LANE_SPACING) + LANE_WIDTH // 2
-        else:
-            lane_x = SCREEN_WIDTH // 2
-        self.floating_texts.append(FloatingText("MISS", lane_x, HIT_LINE_Y - 30, (255, 50, 50)))
-
-    def _register_limitless_spam_punish(self):
-        self.health = max(0, self.health - 5)
-        if self.combo > 0: self.combo = 0
-        # Spam penalty
-        self.spam_count += 1
-
-    def _get_accuracy(self):
-        total_hits = self.perfects + self.greats + self.misses + self.spam_count
-        if total_hits > 0:
-            weighted_score = (self.perfects * 300 + self.greats * 100)
-            max_possible = total_hits * 300
-            return (weighted_score / max_possible) * 100
-        return 100.0 if total_hits == 0 else 0.0
-
+        # Lanes flash while a hold is being held
+        for lane, note in enumerate(self.sim.held_notes):
+            if note:
+                self.hit_flash[lane] = 0.1
 
     def _save_score(self):
-        accuracy = self._get_accuracy()
-        if self.game_over: rank = "F"
-        elif accuracy == 100: rank = "SS"
-        elif accuracy >= 95: rank = "S"
-        elif accuracy >= 90: rank = "A"
-        elif accuracy >= 80: rank = "B"
-        elif accuracy >= 70: rank = "C"
-        else: rank = "D"
-
-        stats = {
-            'score': self.score,
-            'combo': self.max_combo,
-            'accuracy': accuracy,
-            'rank': rank,
-            'perfect': self.perfects,
-            'great': self.greats,
-            'miss': self.misses,
-            'song_title': self.song_title
-        }
+        stats = self.sim.result()
+        accuracy = stats['accuracy']
+        rank = get_rank(accuracy, self.game_over)
+        stats['rank'] = rank
+        stats['song_title'] = self.song_title
+        
+        # Bot plays don't count
+        if not self.game_over and not self.autoplay:
+            self.data_manager.submit_score(self.song_id, stats['score'], stats['combo'], rank, accuracy, stats)
         
-        if not self.game_over:
-            self.data_manager.submit_score(self.song_id, self.score, self.max_combo, rank, accuracy, stats)
+        stats['replay_file'] = self._save_replay()
         self.next_screen_args = stats
 
+    def _save_replay(self):
+        """Keep the play's inputs, finished or abandoned, so it can be watched again.
+        Returns the replay file, or None for bot plays."""
+        if self.replay_file is None and self.song_id and not self.autoplay:
+            # Variable steps change scoring, so their times go in the replay too
+            step_times = None if FIXED_TIMESTEP else self.sim.step_log
+            replay = Replay(self.song_id, chart_hash(self.map_data.chart), self.note_speed,
+                            self.sim.input_log, step_times)
+            self.replay_file = save_replay(replay)
+        return self.replay_file
+
     def _finish_song(self):
         if not self.next_screen_args: self._save_score()
         audio_manager.stop()
         self.next_screen = 'result'
 
     def draw(self, surface):
-        surface.fill(SLATE_NAVY)
-        draw_grid_background(surface, SCREEN_WIDTH, SCREEN_HEIGHT)
+        # Grid, lanes and hit line never change: one blit of the cached layer
+        surface.blit(LayerCache.get("gameplay", surface.get_size(), self._render_static_layer), (0, 0))
         self._draw_lanes(surface)
-        draw_hit_line_glow(surface, HIT_LINE_Y, PLAYFIELD_WIDTH, PLAYFIELD_X)
         self._draw_notes(surface)
         self._draw_hud(surface)
         
         if self.paused: 
             o = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+            allocation_counter.add()
             o.fill((0, 0, 0, 200))
             surface.blit(o, (0,0))
             
@@ -456,6 +357,7 @@ class GameplayScreen:
         
         if self.game_over or self.song_complete:
             o = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+            allocation_counter.add()
             o.fill((0, 0, 0, 100))
             surface.blit(o, (0,0))
         
@@ -463,48 +365,68 @@ class GameplayScreen:
         for ft in self.floating_texts:
             ft.draw(surface)
 
-    def _draw_lanes(self, surface):
+    @staticmethod
+    def prepare_sprites():
+        """Build the sprites and static layer play draws, so the first frames don't have to."""
+        NoteSprites.prepare()
+        HoldBodySprites.prepare()
+        for judgement, color in JUDGEMENT_COLORS.items():
+            JudgementSprites.get(judgement, color, 0)
+        LayerCache.get("gameplay", (SCREEN_WIDTH, SCREEN_HEIGHT), GameplayScreen._render_static_layer)
+
+    @staticmethod
+    def _render_static_layer(layer):
+        lane_font = GameplayAssets.get().lane_font
+        layer.fill(SLATE_NAVY)
+        draw_grid_background(layer, SCREEN_WIDTH, SCREEN_HEIGHT)
         for i in range(NUM_LANES):
-            if i <= 3:
-                x = PLAYFIELD_X + i * (LANE_WIDTH + LANE_SPACING) - 25
-            else:
-                x = PLAYFIELD_X + i * (LANE_WIDTH + LANE_SPACING) + 25
+            x = GameplayScreen._lane_left(i)
+            pygame.draw.rect(layer, DARK_SLATE, (x, 0, LANE_WIDTH, SCREEN_HEIGHT))
+            pygame.draw.line(layer, (*NEON_BLUE, 80), (x, 0), (x, SCREEN_HEIGHT), 1)
+            hit_x = x + LANE_WIDTH // 2
+            pygame.draw.circle(layer, NEON_BLUE, (hit_x, HIT_LINE_Y), NOTE_RADIUS, 2)
+            l = lane_font.render(LANE_LETTERS[i], True, GRAY)
+            allocation_counter.add()
+            layer.blit(l, l.get_rect(center=(hit_x, HIT_LINE_Y+55)))
+        draw_hit_line_glow(layer, HIT_LINE_Y, PLAYFIELD_WIDTH, PLAYFIELD_X)
 
+    @staticmethod
+    def _lane_left(i):
+        if i <= 3:
+            return PLAYFIELD_X + i * (LANE_WIDTH + LANE_SPACING) - 25
+        return PLAYFIELD_X + i * (LANE_WIDTH + LANE_SPACING) + 25
+
+    def _draw_lanes(self, surface):
+        """Dynamic lane parts only; the rest lives in the static layer."""
+        for i in range(NUM_LANES):
+            x = self._lane_left(i)
             if self.hit_flash[i] > 0:
-                s = pygame.Surface((LANE_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-                s.fill((*NEON_BLUE, 30))
-                surface.blit(s, (x, 0))
-            pygame.draw.rect(surface, DARK_SLATE, (x, 0, LANE_WIDTH, SCREEN_HEIGHT))
-            pygame.draw.line(surface, (*NEON_BLUE, 80), (x, 0), (x, SCREEN_HEIGHT), 1)
-            hit_x = x + LANE_WIDTH // 2
-            pygame.draw.circle(surface, NEON_BLUE, (hit_x, HIT_LINE_Y), NOTE_RADIUS, 2)
-            if self.key_pressed[i]:
-               pygame.draw.circle(surface, (*NEON_BLUE, 100), (hit_x, HIT_LINE_Y), NOTE_RADIUS-5)
-            l = self.lane_font.render(LANE_LETTERS[i], True, GRAY)
-            surface.blit(l, l.get_rect(center=(hit_x, HIT_LINE_Y+55)))
+                surface.blit(self.lane_flash, (x, 0))
+            if self.sim.key_pressed[i]:
+                hit_x = x + LANE_WIDTH // 2
+                pygame.draw.circle(surface, (*NEON_BLUE, 100), (hit_x, HIT_LINE_Y), NOTE_RADIUS-5)
 
     def _draw_notes(self, surface):
-        for note in self.active_notes:
-            if note.lane <= 3:
-                lane_x = PLAYFIELD_X + note.lane * (LANE_WIDTH + LANE_SPACING) + LANE_WIDTH // 2 - 25
-            else:
-                lane_x = PLAYFIELD_X + note.lane * (LANE_WIDTH + LANE_SPACING) + LANE_WIDTH // 2 + 25
-            note.draw(surface, lane_x)
+        # The rules run in steps; draw notes at the exact song time of this frame
+        batch = self.sim.note_batch
+        batch.place(self.current_time + self.render_offset, self.note_speed)
+        for note in batch.live_notes():
+            note.draw(surface, self._lane_left(note.lane) + LANE_WIDTH // 2)
 
     def _draw_hud(self, surface):
         w, h = 300, 15
         x, y = 20, 20
         pygame.draw.rect(surface, DARK_SLATE, (x, y, w, h), border_radius=4)
-        fill = int(w * (self.health / MAX_HEALTH))
+        fill = int(w * (self.sim.health / MAX_HEALTH))
         if fill > 0: pygame.draw.rect(surface, NEON_BLUE, (x, y, fill, h), border_radius=4)
         
-        s_txt = self.score_font.render(f"{int(self.score):08d}", True, WHITE)
+        s_txt = self.hud_score.get(int(self.sim.score))
         score_rect = s_txt.get_rect(topright=(SCREEN_WIDTH - 20, 20))
         surface.blit(s_txt, score_rect)
         
-        acc = self._get_accuracy()
-        acc_text = f"{acc:.2f}%"
-        a_surf = self.percent_font.render(acc_text, True, NEON_BLUE)
+        # Accuracy only changes when a judgement is made
+        sim = self.sim
+        a_surf = self.hud_accuracy.get((sim.perfects, sim.greats, sim.misses, sim.spam_count))
         a_rect = a_surf.get_rect(topright=(SCREEN_WIDTH - 60, score_rect.bottom + 10))
         surface.blit(a_surf, a_rect)
         
@@ -515,28 +437,16 @@ class GameplayScreen:
         
         duration = self.map_data.get_duration_ms()
         progress = (self.current_time / duration) if duration > 0 else 0
-        if progress > 0:
+        pie_s = self.progress_pie.get(progress)
+        if pie_s:
             r = radius - 2
-            pie_s = pygame.Surface((r*2, r*2), pygame.SRCALPHA)
-            points = [(r, r)]
-            start_angle = -90
-            end_angle = start_angle + (360 * progress)
-            step = 10
-            for ang in range(int(start_angle), int(end_angle), step):
-                rad = math.radians(ang)
-                px = r + math.cos(rad) * r
-                py = r + math.sin(rad) * r
-                points.append((px, py))
-            rad = math.radians(end_angle)
-            px = r + math.cos(rad) * r
-            py = r + math.sin(rad) * r
-            points.append((px, py))
-            if len(points) > 2:
-                pygame.draw.polygon(pie_s, NEON_BLUE, points)
-                surface.blit(pie_s, (cx-r, cy-r))
+            surface.blit(pie_s, (cx-r, cy-r))
+
+        if self.autoplay:
+            surface.blit(self.autoplay_text, (x, y + h + 8))
 
-        if self.combo > 0:
-            c_txt = self.combo_font.render(f"{self.combo}x", True, WHITE)
+        if self.sim.combo > 0:
+            c_txt = self.hud_combo.get(self.sim.combo)
             surface.blit(c_txt, (20, SCREEN_HEIGHT - 80))
 
 
@@ -2,10 +2,10 @@ import pygame
 import random
 from game.settings import (
     SCREEN_WIDTH, SCREEN_HEIGHT,
-    SLATE_NAVY, NEON_BLUE, WHITE, DARK_SLATE,
+    NEON_BLUE, WHITE, DARK_SLATE,
     BUTTON_WIDTH, BUTTON_HEIGHT, TITLE
 )
-from game.ui import Button, draw_grid_background
+from game.ui import Button, draw_background
 from game.visuals import create_neon_text
 
 class FallingParticle:
@@ -98,8 +98,7 @@ class HomeScreen:
         self.particles = [p for p in self.particles if p.alpha > 0]
 
     def draw(self, surface):
-        surface.fill(SLATE_NAVY)
-        draw_grid_background(surface, SCREEN_WIDTH, SCREEN_HEIGHT)
+        draw_background(surface)
 
         for p in self.particles: p.draw(surface)
         
@@ -0,0 +1,105 @@
+import pygame
+from game.settings import (
+    SCREEN_WIDTH, SCREEN_HEIGHT,
+    NEON_BLUE, WHITE, DARK_SLATE, GRAY
+)
+from game.screens.gameplay import GameplayScreen
+from game.replay import ReplayPlayer, load_replay, chart_hash
+from game.ui import floating_text_pool
+from game.frame_stats import allocation_counter
+
+REPLAY_SPEEDS = (0.5, 1, 2, 4, 8)
+SEEK_STEP_MS = 5000
+
+# Progress bar along the bottom of the screen; click it to jump
+BAR_RECT = pygame.Rect(200, SCREEN_HEIGHT - 14, SCREEN_WIDTH - 400, 6)
+
+
+class ReplayScreen(GameplayScreen):
+    """Plays back a recorded play (silently) at 0.5x-8x, with seeking.
+
+    Controls: SPACE pause, UP/DOWN speed, LEFT/RIGHT jump 5s, click the bar to seek, ESC back.
+    """
+
+    def __init__(self, replay_file):
+        self.replay = load_replay(replay_file)
+        super().__init__(self.replay.map_file, autoplay=False, audio=False)
+
+        chart = self.map_data.chart
+        self.player = ReplayPlayer(self.replay, chart, getattr(self.map_data, "difficulty", 1))
+        self.sim = self.player.sim
+        self.render_offset = 0  # Playback is silent, so notes sit on the replay's own clock
+        self.chart_changed = chart_hash(chart) != self.replay.chart_digest
+
+        self.speed_index = REPLAY_SPEEDS.index(1)
+        self.halted = False
+        self.end_time = self.map_data.get_duration_ms()
+        self.info_font = pygame.font.Font(None, 28)
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                self.next_screen = 'select'
+            elif event.key == pygame.K_SPACE:
+                self.halted = not self.halted
+            elif event.key == pygame.K_UP:
+                self.speed_index = min(self.speed_index + 1, len(REPLAY_SPEEDS) - 1)
+            elif event.key == pygame.K_DOWN:
+                self.speed_index = max(self.speed_index - 1, 0)
+            elif event.key == pygame.K_RIGHT:
+                self._seek(self.current_time + SEEK_STEP_MS)
+            elif event.key == pygame.K_LEFT:
+                self._seek(self.current_time - SEEK_STEP_MS)
+
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if BAR_RECT.inflate(0, 20).collidepoint(event.pos):
+                fraction = (event.pos[0] - BAR_RECT.x) / BAR_RECT.width
+                self._seek(fraction * self.end_time)
+
+    def _seek(self, t):
+        t = max(self.player.snapshots[0][0], min(t, self.end_time))
+        self.player.seek(t)
+        self.sim = self.player.sim
+        self.current_time = t
+        # Effects from before the jump don't belong to the new position
+        for ft in self.floating_texts:
+            floating_text_pool.release(ft)
+        self.floating_texts = []
+        self.sim.events.clear()
+        self.hit_flash = [0] * len(self.hit_flash)
+        self.judgement_timer = 0
+
+    def update(self, dt):
+        if not self.halted and self.current_time < self.end_time:
+            speed = REPLAY_SPEEDS[self.speed_index]
+            self.current_time = min(self.current_time + dt * 1000 * speed, self.end_time)
+            self.player.advance_to(self.current_time)
+            self.sim = self.player.sim
+            self._show_judgements()
+        self._update_effects(dt)
+
+    def draw(self, surface):
+        super().draw(surface)
+
+        pygame.draw.rect(surface, DARK_SLATE, BAR_RECT, border_radius=4)
+        progress = max(0.0, min(self.current_time / self.end_time, 1.0)) if self.end_time > 0 else 0
+        fill = int(BAR_RECT.width * progress)
+        if fill > 0:
+            pygame.draw.rect(surface, NEON_BLUE, (BAR_RECT.x, BAR_RECT.y, fill, BAR_RECT.height), border_radius=4)
+
+        state = "PAUSED" if self.halted else f"{REPLAY_SPEEDS[self.speed_index]:g}x"
+        seconds = max(0, int(self.current_time // 1000))
+        info = f"REPLAY  {state}  {seconds // 60}:{seconds % 60:02d}"
+        surf = self.info_font.render(info, True, WHITE)
+        allocation_counter.add()
+        surface.blit(surf, surf.get_rect(bottomright=(SCREEN_WIDTH - 20, BAR_RECT.y - 12)))
+
+        if self.chart_changed:
+            warn = self.info_font.render("Map changed since this replay was recorded", True, GRAY)
+            allocation_counter.add()
+            surface.blit(warn, warn.get_rect(midtop=(SCREEN_WIDTH // 2, 60)))
+
+    def get_next_screen(self):
+        n = self.next_screen
+        self.next_screen = None
+        return n, None
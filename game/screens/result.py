@@ -2,9 +2,9 @@ import pygame
 import game.settings as settings
 from game.settings import (
     SCREEN_WIDTH, SCREEN_HEIGHT,
-    SLATE_NAVY, NEON_BLUE, WHITE, DARK_SLATE, GRAY
+    NEON_BLUE, WHITE, DARK_SLATE, GRAY
 )
-from game.ui import Button, draw_grid_background
+from game.ui import Button, DirtyRects, draw_background
 from game.visuals import create_neon_text
 
 class ResultScreen:
@@ -38,6 +38,11 @@ class ResultScreen:
             'retry': Button(SCREEN_WIDTH - 280, btn_y, btn_w, 45, "RETRY"),
             'back': Button(SCREEN_WIDTH - 140, btn_y, btn_w, 45, "BACK"),
         }
+        if stats.get('replay_file'):
+            self.buttons['replay'] = Button(SCREEN_WIDTH - 420, btn_y, btn_w, 45, "REPLAY")
+        
+        # Static page: after the first frame only button hovers are redrawn
+        self.dirty = DirtyRects()
 
     def handle_event(self, event):
         for name, btn in self.buttons.items():
@@ -46,9 +51,12 @@ class ResultScreen:
                     self.next_screen = 'gameplay' # Retry same song
                 elif name == 'back':
                     self.next_screen = 'select'
+                elif name == 'replay':
+                    self.next_screen = 'replay'
         
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_r: self.next_screen = 'gameplay'
+            if event.key == pygame.K_w and 'replay' in self.buttons: self.next_screen = 'replay'
             if event.key == pygame.K_ESCAPE: self.next_screen = 'select'
 
     def update(self, dt):
@@ -56,8 +64,12 @@ class ResultScreen:
         for b in self.buttons.values(): b.update(mp)
 
     def draw(self, surface):
-        surface.fill(SLATE_NAVY)
-        draw_grid_background(surface, SCREEN_WIDTH, SCREEN_HEIGHT)
+        if self.dirty.full:
+            self._draw_page(surface)
+        self.dirty.redraw_buttons(surface, self.buttons.values())
+
+    def _draw_page(self, surface):
+        draw_background(surface)
         
         # Title
         t_rect = self.title_surf.get_rect(center=(SCREEN_WIDTH//2, 80))
@@ -101,10 +113,16 @@ class ResultScreen:
             
             surface.blit(l, (x_base, y))
             surface.blit(v, (x_base + 200, y - 5))
-            
-        for btn in self.buttons.values(): btn.draw(surface)
+
+    def get_dirty_rects(self):
+        return self.dirty.get_rects()
+
+    def invalidate(self):
+        self.dirty.invalidate()
 
     def get_next_screen(self):
         n = self.next_screen
         self.next_screen = None
+        if n == 'replay':
+            return n, self.stats['replay_file']
         return n, None 
@@ -4,12 +4,17 @@ from game.map_manager import MapManager
 import game.settings as settings
 from game.settings import (
     SCREEN_WIDTH, SCREEN_HEIGHT,
-    SLATE_NAVY, NEON_BLUE, WHITE, DARK_SLATE, GRAY
+    NEON_BLUE, WHITE, DARK_SLATE, GRAY
 )
-from game.ui import Button, Panel, draw_grid_background
+from game.ui import Button, Panel, draw_background
 from game.data_manager import DataManager
 from game.visuals import create_neon_text, draw_star
 from game.audio_manager import audio_manager
+from game.preload import GameplayAssets, GameplayPreload
+from game.screens.gameplay import GameplayScreen
+
+# A highlighted map starts loading for gameplay once it has stayed selected this long (s)
+PRELOAD_DELAY = 0.2
 
 class SongSelectScreen:
     """Song selection screen - selects song and passes to gameplay."""
@@ -43,6 +48,12 @@ class SongSelectScreen:
         self.image_cache = {}
         
         self.current_preview = None
+        self.preload = None  # Map being readied for gameplay in the background
+        self.preload_timer = None
+        # What a play draws is built here, on the main thread, so the first
+        # frames of every play find it ready
+        GameplayAssets.get()
+        GameplayScreen.prepare_sprites()
     
     def handle_event(self, event):
         for name, btn in self.buttons.items():
@@ -74,6 +85,8 @@ class SongSelectScreen:
             elif event.key == pygame.K_ESCAPE:
                 audio_manager.stop()
                 self.next_screen = 'menu'
+            elif event.key == pygame.K_TAB:
+                settings.autoplay = not settings.autoplay
             
             if prev_index != self.selected_index:
                 self._play_preview()
@@ -94,8 +107,9 @@ class SongSelectScreen:
         if not self.maps: return
         
         selected_map = self.maps[self.selected_index]
-        # Load map data to get audio file
-        map_data = self.map_manager.load_map(selected_map["filename"])
+        self.preload_timer = PRELOAD_DELAY
+        # Only the audio info is needed, so skip the hit objects
+        map_data = self.map_manager.load_map_header(selected_map["filename"])
         if map_data.audio_file and map_data.audio_file != self.current_preview:
             audio_manager.stop()
             if audio_manager.load(map_data.audio_file):
@@ -106,9 +120,19 @@ class SongSelectScreen:
         mp = pygame.mouse.get_pos()
         for b in self.buttons.values(): b.update(mp)
 
+        # Wait for scrolling to settle, so only maps the player stops on get loaded
+        if self.preload_timer is not None:
+            self.preload_timer -= dt
+            if self.preload_timer <= 0:
+                self.preload_timer = None
+                filename = self.maps[self.selected_index]["filename"]
+                if self.preload is None or self.preload.map_file != filename:
+                    self.preload = GameplayPreload(filename)
+
     def refresh_data(self):
         self.data_manager.load_scores()
         self.maps = self.map_manager.list_maps()
+        self.preload = None  # The map may have been edited since
         self.selected_index = min(self.selected_index, max(0, len(self.maps) - 1))
         self._play_preview()
 
@@ -134,8 +158,7 @@ class SongSelectScreen:
         return None
 
     def draw(self, surface):
-        surface.fill(SLATE_NAVY)
-        draw_grid_background(surface, SCREEN_WIDTH, SCREEN_HEIGHT)
+        draw_background(surface)
         
         padding_offset = 30 # roughly
         surface.blit(self.title_surf, (50 - padding_offset, 10))
@@ -147,6 +170,10 @@ class SongSelectScreen:
         self._draw_preview(surface)
         
         for b in self.buttons.values(): b.draw(surface)
+        
+        auto = "AUTOPLAY: ON" if settings.autoplay else "AUTOPLAY: OFF"
+        a = self.small_font.render(f"{auto}  (TAB)", True, NEON_BLUE if settings.autoplay else GRAY)
+        surface.blit(a, a.get_rect(midright=(SCREEN_WIDTH - 160, SCREEN_HEIGHT - 37)))
 
     def _draw_list(self, surface):
         count = 10
@@ -1,50 +1,247 @@
+import time
+import numpy as np
 import pygame
 from game.settings import (
     SCREEN_WIDTH, SCREEN_HEIGHT,
-    SLATE_NAVY, NEON_BLUE, WHITE
+    NEON_BLUE, WHITE, GRAY
 )
-from game.ui import Button, draw_grid_background
+from game.ui import Button, DirtyRects, draw_background
 from game.visuals import create_neon_text
+from game.data_manager import DataManager
+from game.audio_manager import audio_manager
+
+# Latency calibration
+CALIBRATION_BPM = 120
+BEAT_MS = 60000 / CALIBRATION_BPM
+LEAD_IN_BEATS = 4        # Beats to get into the rhythm before taps count
+CALIBRATION_BEATS = 16   # Beats that are measured
+MAX_TAP_ERROR_MS = 200   # Taps further than this from any beat are ignored
+MIN_TAPS = 4             # Fewer matched taps than this gives no result
+FLASH_MS = 100
+
+
+def _now_ms():
+    return time.perf_counter_ns() / 1_000_000
+
+
+def _format_offset(offset_ms):
+    return "not set" if offset_ms is None else f"{offset_ms:+.1f} ms"
+
+
+def _make_click(frequency=1000, length_ms=40):
+    """Short decaying sine blip for the metronome, generated with numpy."""
+    init = pygame.mixer.get_init()
+    if not init:
+        return None
+    rate, _, channels = init
+    t = np.arange(int(rate * length_ms / 1000)) / rate
+    wave = (np.sin(2 * np.pi * frequency * t) * np.exp(-t * 120) * 16000).astype(np.int16)
+    if channels > 1:
+        wave = np.repeat(wave[:, None], channels, axis=1)
+    return pygame.sndarray.make_sound(np.ascontiguousarray(wave))
+
 
 class SettingsScreen:
-    """Settings screen - Currently Work In Progress."""
-    
+    """Settings screen - audio/visual latency calibration."""
+
     def __init__(self):
         self.next_screen = None
         self.font = pygame.font.Font(None, 64)
         self.small_font = pygame.font.Font(None, 32)
-        
+
         # Glow Title
         self.title_surf = create_neon_text("SETTINGS", self.font, WHITE, NEON_BLUE)
-        
+
         # Back Button
         self.back_btn = Button(20, SCREEN_HEIGHT - 60, 100, 45, "BACK")
-        
+
+        btn_w, btn_h, spacing = 180, 50, 30
+        start_x = SCREEN_WIDTH // 2 - (3 * btn_w + 2 * spacing) // 2
+        self.test_buttons = {
+            'audio': Button(start_x, 320, btn_w, btn_h, "AUDIO TEST"),
+            'visual': Button(start_x + btn_w + spacing, 320, btn_w, btn_h, "VISUAL TEST"),
+            'reset': Button(start_x + 2 * (btn_w + spacing), 320, btn_w, btn_h, "RESET"),
+        }
+
+        # Saved offsets (None until that test has been run); gameplay reads them
+        self.data_manager = DataManager()
+        self.audio_offset = self.data_manager.get_setting("audio_offset_ms", None)
+        self.visual_offset = self.data_manager.get_setting("visual_offset_ms", None)
+
+        # Calibration state ('audio', 'visual' or None)
+        self.mode = None
+        self.click = None
+        self.beat_times = []   # When each beat was heard/shown (perf counter ms)
+        self.tap_times = []
+        self.next_beat_at = 0
+        self.flash_pending = False
+        self.flash_until = 0
+        self.result_text = ""
+
+        # Static page: after the first frame only button hovers are redrawn
+        self.dirty = DirtyRects()
+
     def handle_event(self, event):
+        if self.mode:
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                self._stop_test()
+                self.result_text = "Calibration cancelled"
+            elif event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN):
+                self.tap_times.append(_now_ms())
+            return
+
         if self.back_btn.is_clicked(event):
             self.next_screen = 'menu'
-            
+
+        for name, btn in self.test_buttons.items():
+            if btn.is_clicked(event):
+                if name == 'reset':
+                    self._save_offsets(None, None)
+                    self.result_text = "Offsets reset"
+                    self.dirty.invalidate()
+                else:
+                    self._start_test(name)
+
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
                 self.next_screen = 'menu'
 
+    def _start_test(self, mode):
+        if mode == 'audio':
+            if self.click is None:
+                self.click = _make_click()
+            if self.click is None:
+                self.result_text = "No audio device"
+                self.dirty.invalidate()
+                return
+            audio_manager.stop()
+        self.mode = mode
+        self.beat_times = []
+        self.tap_times = []
+        self.next_beat_at = _now_ms() + BEAT_MS
+        self.flash_pending = False
+        self.flash_until = 0
+
+    def _stop_test(self):
+        self.mode = None
+        self.dirty.invalidate()
+
+    def _finish_test(self):
+        """Match taps to beats and store the mean offset."""
+        counted = np.array(self.beat_times[LEAD_IN_BEATS:])
+        offsets = []
+        for tap in self.tap_times:
+            errors = tap - counted
+            nearest = errors[np.argmin(np.abs(errors))]
+            if abs(nearest) <= MAX_TAP_ERROR_MS:
+                offsets.append(nearest)
+
+        mode = self.mode
+        self._stop_test()
+        if len(offsets) < MIN_TAPS:
+            self.result_text = "Not enough taps on the beat - try again"
+            return
+
+        mean = round(float(np.mean(offsets)), 1)
+        spread = float(np.std(offsets))
+        if mode == 'audio':
+            self._save_offsets(mean, self.visual_offset)
+        else:
+            self._save_offsets(self.audio_offset, mean)
+        self.result_text = f"{mode.upper()}: {mean:+.1f} ms  (spread {spread:.1f} ms, {len(offsets)} taps)"
+
+    def _save_offsets(self, audio_offset, visual_offset):
+        self.audio_offset = audio_offset
+        self.visual_offset = visual_offset
+        self.data_manager.set_setting("audio_offset_ms", audio_offset)
+        self.data_manager.set_setting("visual_offset_ms", visual_offset)
+
     def update(self, dt):
-        self.back_btn.update(pygame.mouse.get_pos())
+        mp = pygame.mouse.get_pos()
+        self.back_btn.update(mp)
+        for btn in self.test_buttons.values(): btn.update(mp)
+
+        if not self.mode:
+            return
+
+        now = _now_ms()
+        if now >= self.next_beat_at:
+            self.next_beat_at += BEAT_MS
+            if len(self.beat_times) >= LEAD_IN_BEATS + CALIBRATION_BEATS:
+                self._finish_test()
+            elif self.mode == 'audio':
+                # Heard once the mixer's buffer has played out
+                self.click.play()
+                self.beat_times.append(_now_ms() + audio_manager.output_latency)
+            else:
+                # Timed when the frame with the flash is drawn
+                self.flash_pending = True
 
     def draw(self, surface):
-        surface.fill(SLATE_NAVY)
-        draw_grid_background(surface, SCREEN_WIDTH, SCREEN_HEIGHT)
-        
+        if self.mode:
+            self._draw_test(surface)
+            return
+        if self.dirty.full:
+            self._draw_page(surface)
+        self.dirty.redraw_buttons(surface, [self.back_btn, *self.test_buttons.values()])
+
+    def _draw_page(self, surface):
+        draw_background(surface)
+
         # Title
         t_rect = self.title_surf.get_rect(center=(SCREEN_WIDTH//2, 80))
         surface.blit(self.title_surf, t_rect)
-        
-        # WIP Text
-        wip_text = "WORK IN PROGRESS"
-        w_surf = self.small_font.render(wip_text, True, WHITE)
-        surface.blit(w_surf, w_surf.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2)))
-        
-        self.back_btn.draw(surface)
+
+        lines = [
+            f"Audio offset: {_format_offset(self.audio_offset)}",
+            f"Visual offset: {_format_offset(self.visual_offset)}",
+        ]
+        for i, line in enumerate(lines):
+            surf = self.small_font.render(line, True, WHITE)
+            surface.blit(surf, surf.get_rect(center=(SCREEN_WIDTH//2, 190 + i * 45)))
+
+        if self.result_text:
+            surf = self.small_font.render(self.result_text, True, NEON_BLUE)
+            surface.blit(surf, surf.get_rect(center=(SCREEN_WIDTH//2, 430)))
+
+        hint = "Tap any key or click on every beat. The first few beats are not counted."
+        surf = self.small_font.render(hint, True, GRAY)
+        surface.blit(surf, surf.get_rect(center=(SCREEN_WIDTH//2, 500)))
+
+    def _draw_test(self, surface):
+        draw_background(surface)
+
+        t_rect = self.title_surf.get_rect(center=(SCREEN_WIDTH//2, 80))
+        surface.blit(self.title_surf, t_rect)
+
+        if self.flash_pending:
+            self.flash_pending = False
+            self.beat_times.append(_now_ms())
+            self.flash_until = _now_ms() + FLASH_MS
+
+        if self.mode == 'visual':
+            center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+            if _now_ms() < self.flash_until:
+                pygame.draw.circle(surface, WHITE, center, 80)
+            pygame.draw.circle(surface, NEON_BLUE, center, 80, 3)
+            instruction = "Tap on every flash"
+        else:
+            instruction = "Tap on every click"
+
+        beat = max(0, len(self.beat_times) - LEAD_IN_BEATS)
+        status = "Get ready..." if len(self.beat_times) < LEAD_IN_BEATS else f"Beat {beat} / {CALIBRATION_BEATS}"
+        for i, line in enumerate((instruction, status, "ESC to cancel")):
+            surf = self.small_font.render(line, True, GRAY if i == 2 else WHITE)
+            surface.blit(surf, surf.get_rect(center=(SCREEN_WIDTH//2, 180 + i * 40)))
+
+    def get_dirty_rects(self):
+        # The tests animate the whole page, so they flip the full frame
+        if self.mode:
+            return None
+        return self.dirty.get_rects()
+
+    def invalidate(self):
+        self.dirty.invalidate()
 
     def get_next_screen(self):
         n = self.next_screen
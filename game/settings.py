@@ -4,6 +4,18 @@ SCREEN_HEIGHT = 720
 TITLE = "QWERTY"
 FPS = 60
 
+# Gameplay rules run in fixed steps of song time, independent of the frame rate;
+# rendering shows notes at the exact song time between steps
+FIXED_TIMESTEP = True
+SIMULATION_HZ = 1000
+
+# Screens that report changed regions push only those to the display
+# (pygame.display.update) instead of flipping the whole frame
+DIRTY_RECTS = True
+
+# Frame timing overlay, toggled with F3 (timings are recorded either way)
+SHOW_FRAME_STATS = False
+
 # Theme Colors (RGB)
 SLATE_NAVY = (15, 23, 42)
 NEON_BLUE = (56, 189, 248)
@@ -27,7 +39,18 @@ PLAYFIELD_X = (SCREEN_WIDTH - PLAYFIELD_WIDTH) // 2
 NOTE_RADIUS = 30
 BASE_NOTE_SPEED = 200  # pixels per second (will scale with difficulty)
 HIT_LINE_Y = SCREEN_HEIGHT - 100
-HIT_WINDOW = 60  # pixels tolerance for hit detection
+
+# Judgement windows, in ms either side of a note's hit time. They match the old
+# pixel windows at the default 300 px/s scroll, but no longer depend on speed or FPS.
+PERFECT_WINDOW_MS = 66
+GREAT_WINDOW_MS = 200   # Furthest a key press can be from a note and still hit it
+MISS_WINDOW_MS = 266    # Unhit notes this late are counted as misses
+SPAM_WINDOW_MS = 666    # Presses with no note this close are punished as spam
+INPUT_OFFSET_MS = 0     # Added to every key press's song time (latency tuning)
+
+# Autoplay: a bot plays the chart from its hit times (testing and profiling)
+AUTOPLAY_JITTER_MS = 0  # Max random timing error of the bot's presses (0 = perfect)
+AUTOPLAY_TAP_MS = 40    # How long the bot holds a key for a tap note
 
 # Scoring
 BASE_SCORE = 300
@@ -51,3 +74,5 @@ FONT_SMALL = 16
 
 # Map file reference for gameplay
 current_map_file = None
+# Let the bot play the next song (toggled with TAB on the song select screen)
+autoplay = False
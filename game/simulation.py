@@ -0,0 +1,336 @@
+"""
+Simulation - the game rules (spawning, judgement, holds, health, scoring) with no
+display or audio. GameplayScreen drives one in real time; anything else can feed it
+a chart and timestamped inputs and run it as fast as the CPU allows.
+"""
+import math
+from collections import deque
+from game.settings import (
+    NUM_LANES, SCREEN_HEIGHT, HIT_LINE_Y,
+    PERFECT_WINDOW_MS, GREAT_WINDOW_MS, MISS_WINDOW_MS, SPAM_WINDOW_MS,
+    MAX_HEALTH, HEALTH_DRAIN_PER_MISS, SIMULATION_HZ
+)
+from game.map_manager import TYPE_HOLD
+from game.note import NoteBatch, note_pool
+
+# Holds score a tick at this interval of held song time, whatever the frame rate
+HOLD_TICK_MS = 1000 / 60
+
+# Notes hitting before this are skipped (grace period at the start of a song)
+GRACE_MS = 2000
+START_TIME = -2000
+
+DEFAULT_NOTE_SPEED = 300  # pixels per second
+
+# Input times are kept to this resolution, so a replay can store them exactly
+INPUT_RESOLUTION_MS = 0.1
+
+
+def quantize_time(time_ms):
+    return round(time_ms / INPUT_RESOLUTION_MS) * INPUT_RESOLUTION_MS
+
+
+def get_rank(accuracy, failed=False):
+    if failed: return "F"
+    elif accuracy == 100: return "SS"
+    elif accuracy >= 95: return "S"
+    elif accuracy >= 90: return "A"
+    elif accuracy >= 80: return "B"
+    elif accuracy >= 70: return "C"
+    return "D"
+
+
+class Simulation:
+    """One play of a chart, advanced in fixed steps of song time (`advance_to`) or
+    one variable step per frame (`step_to`).
+
+    Inputs are queued with `press`/`release` and judged at their own timestamps.
+    Every judgement is appended to `events` as (time, lane, judgement) so a
+    front end can show it; nothing else leaves the simulation.
+    """
+
+    def __init__(self, chart, difficulty=1, note_speed=DEFAULT_NOTE_SPEED, step_ms=1000.0 / SIMULATION_HZ):
+        self.chart = chart
+        self.difficulty = difficulty
+        self.note_speed = note_speed
+        self.step_ms = step_ms
+        # Notes are spawned once they are this close to the hit line
+        self.spawn_ahead_ms = ((SCREEN_HEIGHT + 100) / note_speed) * 1000
+
+        # Spawn cursor into the columnar chart; skip notes < 2000ms (Grace period ignore)
+        self.spawn_index = chart.index_at(GRACE_MS)
+        self.note_batch = NoteBatch()
+        # Unjudged notes per lane in hit-time order, plus the hold being held in each lane
+        self.lane_queues = [deque() for _ in range(NUM_LANES)]
+        self.held_notes = [None] * NUM_LANES
+        self.hold_ticked_to = [0.0] * NUM_LANES  # Song time each held hold has scored ticks up to
+        self.key_pressed = [False] * NUM_LANES
+        # Lane key presses/releases as (song time, lane, is_down), in time order
+        self.input_queue = deque()
+        self.input_log = []  # Every input queued through press/release, for replays
+        self.step_log = []  # Song time of every `step_to`, so replays can repeat variable steps
+        self.time = START_TIME  # Song time the rules have been advanced to
+        # Notes can't be missed or cleared before this; spawns and inputs reset it
+        self.deadline = -math.inf
+        self.events = []
+
+        # Stats
+        self.score = 0
+        self.combo = 0
+        self.max_combo = 0
+        self.health = MAX_HEALTH
+        self.perfects = 0
+        self.greats = 0
+        self.misses = 0
+        self.spam_count = 0
+
+    @property
+    def failed(self):
+        return self.health <= 0
+
+    @property
+    def finished(self):
+        """All notes spawned and judged."""
+        return self.spawn_index >= len(self.chart) and self.note_batch.count == 0
+
+    def press(self, time, lane):
+        self._queue_input(time, lane, True)
+
+    def release(self, time, lane):
+        self._queue_input(time, lane, False)
+
+    def _queue_input(self, time, lane, is_down):
+        entry = (quantize_time(time), lane, is_down)
+        self.input_queue.append(entry)
+        self.input_log.append(entry)
+
+    def advance_to(self, t):
+        """Run whole steps up to song time t. Stops early if health runs out."""
+        step_ms = self.step_ms
+        while self.time + step_ms <= t and not self.failed:
+            self._skip_idle(t)
+            self.step(self.time + step_ms)
+
+    def step_to(self, t):
+        """One variable step up to song time t (for running without fixed steps)."""
+        t = quantize_time(t)
+        if t <= self.time or self.failed:
+            return
+        self.step_log.append(t)
+        self.step(t)
+
+    def run(self):
+        """Play the rest of the chart with the queued inputs and return the result."""
+        end = self.time
+        if len(self.chart):
+            end = float((self.chart.times + self.chart.durations).max())
+        if self.input_queue:
+            end = max(end, self.input_queue[-1][0])
+        self.advance_to(end + MISS_WINDOW_MS + self.step_ms)
+        # Released holds scroll away before they count as done
+        while not (self.finished or self.failed):
+            self.advance_to(self.time + 1000)
+        return self.result()
+
+    def _skip_idle(self, t):
+        """Jump over steps in which nothing can happen (nothing held, no input, spawn or miss due)."""
+        if any(self.held_notes):
+            return
+        next_event = t
+        if self.input_queue:
+            next_event = min(next_event, self.input_queue[0][0])
+        if self.spawn_index < len(self.chart):
+            next_event = min(next_event, self.chart.times[self.spawn_index] - self.spawn_ahead_ms)
+        if self.note_batch.count:
+            next_event = min(next_event, self.deadline)
+        # Stay a step short, so the step that handles the event runs normally
+        skip = (next_event - self.time) // self.step_ms - 1
+        if skip > 0:
+            self.time += int(skip) * self.step_ms
+
+    def step(self, t):
+        """Advance the game rules by one simulation step, to song time t."""
+        self.time = t
+
+        # Spawn notes (look ahead)
+        chart = self.chart
+        spawn_until = t + self.spawn_ahead_ms
+        while self.spawn_index < len(chart) and chart.times[self.spawn_index] <= spawn_until:
+            i = self.spawn_index
+            self.spawn_index += 1
+            lane = int(chart.lanes[i])
+            hit_time = float(chart.times[i])
+            # Start position off-screen based on time difference
+            start_y = HIT_LINE_Y - ((hit_time - t) / 1000.0) * self.note_speed
+
+            if chart.types[i] == TYPE_HOLD:
+                duration = float(chart.durations[i])
+                length_px = (duration / 1000.0) * self.note_speed
+                new_note = note_pool.acquire_hold(self.note_batch, lane, hit_time, duration, length_px, spawn_y=start_y)
+            else:
+                new_note = note_pool.acquire_note(self.note_batch, lane, hit_time, spawn_y=start_y)
+
+            self.lane_queues[lane].append(new_note)
+            self.deadline = -math.inf
+
+        # Apply the key presses/releases that happened by now. They are judged at
+        # their own timestamps, before any misses up to t are counted.
+        queue = self.input_queue
+        while queue and queue[0][0] <= t:
+            time, lane, is_down = queue.popleft()
+            self.deadline = -math.inf
+            if is_down:
+                self._press_lane(lane, time)
+            else:
+                self._release_lane(lane, time)
+
+        # Positions are only needed to judge; skip the work until something can change
+        if self.note_batch.count and t > self.deadline:
+            missed_slots = self.note_batch.update(t, self.note_speed)
+
+            # Missed notes are always the oldest ones in their lane
+            for slot in missed_slots.tolist():
+                note = self.note_batch.notes[slot]
+                self.lane_queues[note.lane].remove(note)
+                self._register_miss(t, note.lane)
+
+            # Clear notes that were hit, missed or have scrolled away, and recycle them
+            note_pool.release(self.note_batch.release_inactive())
+            self.deadline = self.note_batch.next_deadline(MISS_WINDOW_MS, self.note_speed)
+
+        if self.failed or self.finished:
+            return
+
+        # Handle Hold Ticks
+        for lane in range(NUM_LANES):
+            note = self.held_notes[lane]
+            if self.key_pressed[lane] and note and note.being_held and note.active:
+                # Check tick
+                if t >= note.end_time:
+                    note.active = False
+                    note.hit = True
+                    self.held_notes[lane] = None
+                    self.deadline = -math.inf
+                    self._register_hit(t, lane, "PERFECT", is_hold=True)
+                else:
+                    # Tick at a fixed rate of song time held since the press, so the
+                    # step a press happens to be applied in doesn't change the count
+                    while t - self.hold_ticked_to[lane] >= HOLD_TICK_MS:
+                        self.hold_ticked_to[lane] += HOLD_TICK_MS
+                        self.score += 5
+                        self.health = min(MAX_HEALTH, self.health + 0.05)
+
+    def _press_lane(self, lane, time):
+        # A lane can only be pressed again after being let go (inputs from
+        # anything but a keyboard may skip the release)
+        if self.held_notes[lane]:
+            self._release_lane(lane, time)
+        self.key_pressed[lane] = True
+
+        # Check for Hit: the oldest unjudged note in this lane that can still be hit.
+        # Notes already too late wait in the queue to be counted as misses.
+        queue = self.lane_queues[lane]
+        head = None
+        for note in queue:
+            if time - note.time <= GREAT_WINDOW_MS:
+                head = note
+                break
+
+        if head and head.check_hit(time, GREAT_WINDOW_MS):
+            queue.remove(head)
+            offset = abs(time - head.time)
+            judgement = "PERFECT" if offset < PERFECT_WINDOW_MS else "GREAT"
+            if head.is_hold:
+                head.being_held = True
+                head.was_held = True
+                head.initial_hit_offset = offset
+                self.held_notes[lane] = head
+                self.hold_ticked_to[lane] = time
+                self._register_hit(time, lane, judgement, is_hold=True)
+            else:
+                head.active = False
+                head.hit = True
+                self._register_hit(time, lane, judgement)
+        else:
+            # Spam Punish Check
+            nearby_note = head is not None and abs(time - head.time) < SPAM_WINDOW_MS
+            if not nearby_note:
+                self._register_limitless_spam_punish()
+
+    def _release_lane(self, lane, time):
+        self.key_pressed[lane] = False
+
+        # Release Hold Logic
+        note = self.held_notes[lane]
+        if note and note.being_held and note.active:
+            note.being_held = False
+            self.held_notes[lane] = None
+            if time >= note.end_time:
+                # Let go at or after the tail: the hold is complete, even if no
+                # step has reached its end yet
+                note.active = False
+                note.hit = True
+                self.deadline = -math.inf
+                self._register_hit(time, lane, "PERFECT", is_hold=True)
+                return
+            # Early release punishment
+            self.combo = 0
+            self.events.append((time, lane, "BREAK"))
+
+    def _register_hit(self, time, lane, judgement, is_hold=False):
+        """Score a hit. Holds (start and completion) score without healing."""
+        if judgement == "PERFECT":
+            value = 300
+            self.perfects += 1
+            if not is_hold: self.health = min(MAX_HEALTH, self.health + 2)
+        else:
+            value = 100
+            self.greats += 1
+            if not is_hold: self.health = min(MAX_HEALTH, self.health + 1)
+
+        self.combo += 1
+        self.max_combo = max(self.max_combo, self.combo)
+
+        # Score = Value * (Combo * DifficultyMultiplier)
+        self.score += value * (self.combo * self.difficulty)
+        self.events.append((time, lane, judgement))
+
+    def _register_miss(self, time, lane):
+        self.misses += 1
+        self.combo = 0
+        self.health = max(0, self.health - HEALTH_DRAIN_PER_MISS)
+        self.events.append((time, lane, "MISS"))
+
+    def _register_limitless_spam_punish(self):
+        self.health = max(0, self.health - 5)
+        if self.combo > 0: self.combo = 0
+        # Spam penalty
+        self.spam_count += 1
+
+    def get_accuracy(self):
+        total_hits = self.perfects + self.greats + self.misses + self.spam_count
+        if total_hits > 0:
+            weighted_score = (self.perfects * 300 + self.greats * 100)
+            max_possible = total_hits * 300
+            return (weighted_score / max_possible) * 100
+        return 100.0
+
+    def result(self):
+        accuracy = self.get_accuracy()
+        return {
+            'score': self.score,
+            'combo': self.max_combo,
+            'accuracy': accuracy,
+            'rank': get_rank(accuracy, self.failed),
+            'perfect': self.perfects,
+            'great': self.greats,
+            'miss': self.misses,
+            'spam': self.spam_count,
+        }
+
+
+def simulate(chart, inputs, difficulty=1, note_speed=DEFAULT_NOTE_SPEED):
+    """Score a whole play: inputs are (song time, lane, is_down) in time order."""
+    sim = Simulation(chart, difficulty, note_speed)
+    sim.input_queue.extend(inputs)
+    return sim.run()
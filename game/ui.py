@@ -1,6 +1,7 @@
 import pygame
 
 import random
+from game.frame_stats import allocation_counter
 from game.settings import (
     NEON_BLUE, WHITE, DARK_SLATE, SLATE_NAVY, GRAY,
     BUTTON_WIDTH, BUTTON_HEIGHT, BUTTON_RADIUS,
@@ -31,6 +32,7 @@ class Button:
         
         # Glow effect when hovered
         if self.hovered:
+            allocation_counter.add(3)
             for i in range(3):
                 glow_rect = self.rect.inflate(6 + i * 4, 6 + i * 4)
                 glow_surf = pygame.Surface((glow_rect.width, glow_rect.height), pygame.SRCALPHA)
@@ -43,6 +45,7 @@ class Button:
         
         # Text
         text_surf = self.font.render(self.text, True, color)
+        allocation_counter.add()
         text_x = self.rect.centerx - text_surf.get_width() // 2
         text_rect = text_surf.get_rect(midleft=(text_x, self.rect.centery + 2))
         surface.blit(text_surf, text_rect)
@@ -67,6 +70,7 @@ class Panel:
     def draw(self, surface):
         # Semi-transparent fill
         s = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
+        allocation_counter.add()
         s.fill((*SLATE_NAVY, 220))
         surface.blit(s, self.rect.topleft)
         
@@ -110,6 +114,7 @@ def draw_grid_background(surface, width, height):
     pygame.draw.line(surface, NEON_BLUE, (0, center_y), (width, center_y), 2)
     
     # Additional glow effect on center line
+    allocation_counter.add(3)
     for i in range(1, 4):
         alpha = 60 - i * 15
         line_surf = pygame.Surface((width, 4), pygame.SRCALPHA)
@@ -118,12 +123,86 @@ def draw_grid_background(surface, width, height):
         surface.blit(line_surf, (0, center_y - 2 - i))
 
 
+class LayerCache:
+    """Static background layers, rendered once per resolution and reused every frame."""
+    
+    layers = {}
+    
+    @classmethod
+    def get(cls, name, size, render):
+        """Return the cached layer, calling render(layer) the first time it is needed."""
+        key = (name, tuple(size))
+        layer = cls.layers.get(key)
+        if layer is None:
+            layer = pygame.Surface(size)
+            allocation_counter.add()
+            if pygame.display.get_surface() is not None:
+                layer = layer.convert()
+                allocation_counter.add()
+            render(layer)
+            cls.layers[key] = layer
+        return layer
+
+
+def _render_grid_layer(layer):
+    layer.fill(SLATE_NAVY)
+    draw_grid_background(layer, layer.get_width(), layer.get_height())
+
+
+def draw_background(surface, area=None):
+    """Start a frame with the cached navy grid background (one blit).
+
+    With `area`, only that region is restored (used by dirty-rect redraws).
+    """
+    layer = LayerCache.get("grid", surface.get_size(), _render_grid_layer)
+    if area is None:
+        surface.blit(layer, (0, 0))
+    else:
+        surface.blit(layer, area, area)
+
+
+class DirtyRects:
+    """Dirty-rectangle bookkeeping for mostly static screens.
+
+    The first frame (and any frame after invalidate()) is a full redraw. After
+    that only buttons whose hover state changed are repainted and reported, so
+    the main loop can push just those regions with pygame.display.update.
+    """
+    
+    def __init__(self):
+        self.full = True
+        self.rects = []
+        self.button_states = {}
+    
+    def invalidate(self):
+        self.full = True
+    
+    def redraw_buttons(self, surface, buttons):
+        for btn in buttons:
+            if self.full or self.button_states.get(btn) != btn.hovered:
+                area = btn.rect.inflate(16, 16)  # Covers the hover glow
+                draw_background(surface, area)
+                btn.draw(surface)
+                self.button_states[btn] = btn.hovered
+                if not self.full:
+                    self.rects.append(area)
+    
+    def get_rects(self):
+        """Regions changed since the last call, or None when the whole frame changed."""
+        if self.full:
+            self.full = False
+            return None
+        rects, self.rects = self.rects, []
+        return rects
+
+
 def draw_hit_line_glow(surface, y, width, start_x):
     """Draw glowing hit line across lanes."""
     # Main line
     pygame.draw.line(surface, NEON_BLUE, (start_x, y), (start_x + width, y), 3)
     
     # Glow layers
+    allocation_counter.add(4)
     for i in range(1, 5):
         alpha = 50 - i * 10
         line_surf = pygame.Surface((width, 2), pygame.SRCALPHA)
@@ -132,21 +211,42 @@ def draw_hit_line_glow(surface, y, width, start_x):
         surface.blit(line_surf, (start_x, y + i * 2))
 
 
+class JudgementSprites:
+    """Judgement texts pre-rendered per (text, color) at a set of quantized tilt angles."""
+    
+    ANGLES = list(range(-15, 16, 5))
+    cache = {}
+    
+    @classmethod
+    def get(cls, text, color, angle):
+        frames = cls.cache.get((text, color))
+        if frames is None:
+            if not hasattr(FloatingText, 'FONT'):
+                FloatingText.FONT = pygame.font.Font(None, 28)
+            base = FloatingText.FONT.render(text, True, color)
+            frames = {a: pygame.transform.rotate(base, a) for a in cls.ANGLES}
+            allocation_counter.add(1 + len(frames))
+            cls.cache[(text, color)] = frames
+        return frames[angle]
+
+
 class FloatingText:
     """Floating judgement text with random tilt and fade out."""
     
     def __init__(self, text, x, y, color, duration=0.5):
+        self.reset(text, x, y, color, duration)
+    
+    def reset(self, text, x, y, color, duration=0.5):
+        """(Re)initialise the text, so pooled instances can be reused."""
         self.text = text
         self.x = x
         self.y = y
         self.color = color
         self.duration = duration
         self.timer = duration
-        self.angle = random.uniform(-15, 15)  # Random tilt
-        
-        if not hasattr(FloatingText, 'FONT'):
-             FloatingText.FONT = pygame.font.Font(None, 28)
-        self.font = FloatingText.FONT
+        # Random tilt, snapped to one of the pre-rotated angles
+        self.angle = 5 * round(random.uniform(-15, 15) / 5)
+        self.sprite = JudgementSprites.get(text, color, self.angle)
         
         self.active = True
         self.velocity_y = -50  # Float upward
@@ -162,22 +262,33 @@ class FloatingText:
     def draw(self, surface):
         if not self.active:
             return
-            
-        # Calculate alpha based on remaining time
-        alpha = int(255 * (self.timer / self.duration))
-        
-        # Render text
-        text_surf = self.font.render(self.text, True, self.color)
         
-        # Rotate
-        rotated = pygame.transform.rotate(text_surf, self.angle)
-        
-        # Apply alpha
-        rotated.set_alpha(alpha)
+        # Fade out through per-surface alpha on the shared sprite
+        self.sprite.set_alpha(int(255 * (self.timer / self.duration)))
         
         # Draw centered at position
-        rect = rotated.get_rect(center=(self.x, self.y))
-        surface.blit(rotated, rect)
+        surface.blit(self.sprite, (self.x - self.sprite.get_width() // 2,
+                                   self.y - self.sprite.get_height() // 2))
+
+
+class FloatingTextPool:
+    """Recycles FloatingText instances so judgement bursts don't allocate."""
+    
+    def __init__(self):
+        self.free = []
+    
+    def acquire(self, text, x, y, color, duration=0.5):
+        if self.free:
+            ft = self.free.pop()
+            ft.reset(text, x, y, color, duration)
+            return ft
+        return FloatingText(text, x, y, color, duration)
+    
+    def release(self, ft):
+        self.free.append(ft)
+
+
+floating_text_pool = FloatingTextPool()
 
 
 class InputField:
@@ -1,6 +1,7 @@
 import pygame
 import math
 from PIL import Image, ImageFilter
+from game.frame_stats import allocation_counter
 
 def draw_star(surface, x, y, size, color):
     """Draws a 5-pointed star centered at (x,y)."""
@@ -52,5 +53,6 @@ def create_neon_text(text, font, color, glow_color, blur_radius=10):
     
     # Composite Core Text on top
     final_glow.blit(text_surf, (padding, padding))
+    allocation_counter.add(4)
     
     return final_glow
@@ -1,11 +1,13 @@
 import pygame
 import sys
-from game.settings import SCREEN_WIDTH, SCREEN_HEIGHT, TITLE, FPS
+from game.settings import SCREEN_WIDTH, SCREEN_HEIGHT, TITLE, FPS, DIRTY_RECTS, SHOW_FRAME_STATS
+from game.frame_stats import FrameStats
 from game.screens.home import HomeScreen
 from game.screens.select import SongSelectScreen
 from game.screens.gameplay import GameplayScreen
 from game.screens.settings_screen import SettingsScreen
 from game.screens.result import ResultScreen
+from game.screens.replay_viewer import ReplayScreen
 from game.map_editor.map_select_screen import MapSelectScreen
 from game.map_editor.editor_screen import EditorScreen
 
@@ -14,6 +16,7 @@ from game.map_editor.editor_screen import EditorScreen
 def main():
     pygame.init()
     pygame.font.init()
+    frame_stats = FrameStats(SHOW_FRAME_STATS)
     
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption(TITLE)
@@ -26,6 +29,7 @@ def main():
         'settings': SettingsScreen(),
         'gameplay': None,
         'result': None,
+        'replay': None,
         'map_select': MapSelectScreen(),
         'editor': None
     }
@@ -38,14 +42,23 @@ def main():
     running = True
     while running:
         dt = clock.tick(FPS) / 1000.0
+        frame_stats.begin_frame()
         
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.WINDOWEXPOSED and hasattr(current_screen, 'invalidate'):
+                current_screen.invalidate()
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                frame_stats.toggle()
+                # Static screens must repaint what the overlay covered
+                if hasattr(current_screen, 'invalidate'):
+                    current_screen.invalidate()
             
             result = current_screen.handle_event(event)
             if result == 'quit':
                 running = False
+        frame_stats.mark("events")
         
         current_screen.update(dt)
         
@@ -57,7 +70,8 @@ def main():
             
         if next_screen_key:
             if next_screen_key == 'gameplay':
-                screens['gameplay'] = GameplayScreen()
+                # Song select has usually loaded the map in the background already
+                screens['gameplay'] = GameplayScreen(preload=screens['select'].preload)
                 current_screen_key = 'gameplay'
                 current_screen = screens['gameplay']
                 
@@ -66,6 +80,11 @@ def main():
                 current_screen_key = 'result'
                 current_screen = screens['result']
                 
+            elif next_screen_key == 'replay':
+                screens['replay'] = ReplayScreen(args)
+                current_screen_key = 'replay'
+                current_screen = screens['replay']
+                
             elif next_screen_key == 'editor':
                 screens['editor'] = EditorScreen(args)
                 current_screen_key = 'editor'
@@ -80,10 +99,30 @@ def main():
             elif next_screen_key in screens:
                 current_screen_key = next_screen_key
                 current_screen = screens[next_screen_key]
+            
+            # A screen we return to must repaint everything the last one drew over
+            if hasattr(current_screen, 'invalidate'):
+                current_screen.invalidate()
+        
+        frame_stats.mark("update")
         
         # Draw
         current_screen.draw(screen)
-        pygame.display.flip()
+        overlay_rect = frame_stats.draw(screen) if frame_stats.visible else None
+        frame_stats.mark("draw")
+        
+        # Dirty-rect mode: push only what the screen changed, full flip otherwise
+        rects = None
+        if DIRTY_RECTS and hasattr(current_screen, 'get_dirty_rects'):
+            rects = current_screen.get_dirty_rects()
+        if rects is not None and overlay_rect:
+            rects.append(overlay_rect)
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+        frame_stats.mark("flip")
+        frame_stats.end_frame(current_screen)
     
     pygame.quit()
     sys.exit()
@@ -0,0 +1,56 @@
+import json
+import os
+
+from game.map_manager import MapManager, load_compiled_map
+
+
+def write_map(path, hit_objects):
+    with open(path, 'w') as f:
+        json.dump({
+            "metadata": {"title": "Test", "artist": "", "mapper": "", "difficulty": 1},
+            "audio": {"file": None, "bpm": 120, "offset_ms": 0},
+            "hit_objects": hit_objects,
+        }, f)
+
+
+def compiled(tmp_path, hit_objects):
+    """A map file with an up-to-date compiled cache."""
+    path = tmp_path / "test.json"
+    write_map(path, hit_objects)
+    manager = MapManager()
+    manager.maps_dir = str(tmp_path)
+    manager.load_map("test.json")
+    assert load_compiled_map(str(path)) is not None
+    return path
+
+
+def test_touched_file_keeps_its_cache(tmp_path):
+    path = compiled(tmp_path, [{"time": 3000, "lane": 1}])
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+
+    map_data = load_compiled_map(str(path))
+    assert map_data is not None
+    assert map_data.chart.times.tolist() == [3000]
+    # The cache now carries the new mtime, so the next load skips the hash check
+    assert load_compiled_map(str(path)) is not None
+
+
+def test_changed_file_invalidates_cache(tmp_path):
+    path = compiled(tmp_path, [{"time": 3000, "lane": 1}])
+    write_map(path, [{"time": 3000, "lane": 1}, {"time": 3500, "lane": 2}])
+    assert load_compiled_map(str(path)) is None
+
+
+def test_same_size_edit_invalidates_cache(tmp_path):
+    path = compiled(tmp_path, [{"time": 3000, "lane": 1}])
+    size = os.path.getsize(path)
+    stat = os.stat(path)
+    write_map(path, [{"time": 4000, "lane": 2}])
+    assert os.path.getsize(path) == size
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+    assert load_compiled_map(str(path)) is None
+
+    manager = MapManager()
+    manager.maps_dir = str(tmp_path)
+    assert manager.load_map("test.json").chart.times.tolist() == [4000]
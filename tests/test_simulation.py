@@ -0,0 +1,99 @@
+import pytest
+
+from game.autoplay import autoplay_inputs
+from game.map_manager import ChartColumns
+from game.settings import MISS_WINDOW_MS, MAX_HEALTH, HEALTH_DRAIN_PER_MISS
+from game.simulation import Simulation, simulate
+
+HOLD_CHART = [{"time": 3000, "lane": 0, "type": "hold", "duration": 1000}]
+
+
+def simulate_frames(chart, inputs, frame_ms=1000 / 60):
+    """Run like GameplayScreen with FIXED_TIMESTEP off: one variable step per frame."""
+    sim = Simulation(chart)
+    sim.input_queue.extend(inputs)
+    t = sim.time
+    while not (sim.finished or sim.failed):
+        t += frame_ms
+        sim.step_to(t)
+    return sim.result()
+
+
+def test_late_note_does_not_block_next_note_in_lane():
+    # The 3000 note is past the hit window at 3230 but not yet a miss; the press
+    # belongs to the 3230 note
+    chart = ChartColumns([{"time": 3000, "lane": 0}, {"time": 3230, "lane": 0}])
+    result = simulate(chart, [(3230, 0, True), (3260, 0, False)])
+    assert result["perfect"] == 1
+    assert result["miss"] == 1
+    assert result["spam"] == 0
+
+
+@pytest.mark.parametrize("run", [simulate, simulate_frames], ids=["fixed", "variable"])
+@pytest.mark.parametrize("release_at", [4000, 4005])
+def test_release_after_hold_tail_completes_hold(run, release_at):
+    result = run(ChartColumns(HOLD_CHART), [(3000, 0, True), (release_at, 0, False)])
+    assert result["perfect"] == 2
+    assert result["combo"] == 2
+
+
+def small_chart():
+    return ChartColumns([
+        {"time": 2500, "lane": 0},
+        {"time": 2750, "lane": 3},
+        {"time": 3000, "lane": 1, "type": "hold", "duration": 600},
+        {"time": 3000, "lane": 6},
+        {"time": 3400, "lane": 7},
+        {"time": 4000, "lane": 0},
+    ])
+
+
+def test_autoplay_scores_all_perfect():
+    chart = small_chart()
+    result = simulate(chart, autoplay_inputs(chart))
+    # The hold scores its head and its completion
+    assert result["perfect"] == len(chart) + 1
+    assert result["great"] == result["miss"] == result["spam"] == 0
+    assert result["combo"] == len(chart) + 1
+    assert result["rank"] == "SS"
+
+
+def test_early_hold_release_breaks_combo():
+    sim = Simulation(ChartColumns(HOLD_CHART))
+    sim.input_queue.extend([(3000, 0, True), (3500, 0, False)])
+    result = sim.run()
+    assert (3500, 0, "BREAK") in sim.events
+    assert result["perfect"] == 1
+    assert sim.combo == 0
+
+
+def test_unhit_note_is_missed_after_miss_window():
+    sim = Simulation(ChartColumns([{"time": 3000, "lane": 2}]))
+    sim.advance_to(3000 + MISS_WINDOW_MS)
+    assert sim.misses == 0
+    sim.advance_to(3000 + MISS_WINDOW_MS + 10)
+    assert sim.misses == 1
+    assert sim.health == MAX_HEALTH - HEALTH_DRAIN_PER_MISS
+
+
+def test_press_with_no_note_nearby_is_spam():
+    chart = ChartColumns([{"time": 3000, "lane": 0}])
+    result = simulate(chart, [(3000, 0, True), (3050, 0, False), (5000, 4, True), (5050, 4, False)])
+    assert result["perfect"] == 1
+    assert result["spam"] == 1
+
+
+def test_same_inputs_give_same_result():
+    chart = ChartColumns([
+        {"time": 2200 + i * 90, "lane": (i * 5) % 8, **({"type": "hold", "duration": 300} if i % 7 == 0 else {})}
+        for i in range(200)
+    ])
+    # Jitter puts some presses in the GREAT window and some out of reach
+    inputs = autoplay_inputs(chart, jitter_ms=150, seed=3)
+    runs = []
+    for _ in range(2):
+        sim = Simulation(chart)
+        sim.input_queue.extend(inputs)
+        runs.append((sim.run(), sim.events))
+    assert runs[0] == runs[1]
+    assert runs[0][0]["great"] > 0